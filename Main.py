@@ -7,11 +7,35 @@ import vlc
 from random import *
  
 import webbrowser
+import queue
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 import logging as _logging
 from pymongo import MongoClient
 import json
-import pytz
+from anime_schedule import load_schedule, entries_for_day, next_entry
+from anime_search import SearchIndex
+from schedule_service import SCHEDULE_URL, fetch_schedule
+from perf_trace import tracer
+
+# The in-app browser (cefpython3) is imported and warmed this long after startup
+BROWSER_WARM_UP_MS = 1500
+
+# Callbacks handled per pass of the Tk-side queue consumer
+UI_BATCH_SIZE = 16
+
+# Display size of the character portrait on the home screen
+CHAR_SIZE = (200, 200)
+
+# From this hour on, tomorrow's covers are prefetched in the background
+PREFETCH_FROM_HOUR = 21
+
+# A configured schedule service is revalidated this often, unchanged schedules cost a 304
+SCHEDULE_RELOAD_MS = 5 * 60 * 1000
+
+# Result buttons under the navigation search box, created once and relabelled per keystroke
+SEARCH_RESULT_LIMIT = 8
+DAY_ABBREVIATIONS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
 
 class App(customtkinter.CTk):
     def __init__(self):
@@ -20,15 +44,30 @@ class App(customtkinter.CTk):
         self.title("Arc")
         self.geometry("800x450")
 
-        self.browser_frame = None
+        # In-app browser, set up by start_browser once the window has painted
+        self.browser_service = None
 
         # Character list for kantai
         self.char_list = ['Верный', 'Warspite', 'Kawakaze', 'Yura', 'Ark_Royal']
         self.char_pos = 0
+        # Character name -> CTkImage, squared and scaled once by prepare_portraits
+        self.char_images = {}
         self.kantai_is_start = False
         self.current_sound = None 
         self.mongodb_uri = self.load_mongodb_uri()
 
+        # Results from worker threads, drained on the Tk thread by process_ui_queue
+        self.ui_queue = queue.Queue()
+        # Workers only download and decode cover art, widgets are built on the Tk thread
+        self.image_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cover")
+        # Decoded covers by URL, bounded by the week's schedule. Filled by both pools,
+        # the single prefetch worker warms it with tomorrow's art late in the day
+        self.cover_cache = {}
+        self.prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        # Frame -> number of its latest button load, results of older loads are dropped
+        self.frame_generations = {}
+        self.prefetched_day = None
+
         # Set grid layout 1x2
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
@@ -37,10 +76,17 @@ class App(customtkinter.CTk):
         self.third_frame = customtkinter.CTkFrame(self, corner_radius=0, fg_color="transparent")
         
 
-        # Check day of week and import anime list
+        # Check day of week, anime list is loaded in the background once the window is up
         self.day_of_week = datetime.date.today().weekday()
-        self.anime_list = self.get_anime_list_from_db()  # Fetch anime list from DB
-        self.anime_next = self.upcoming_anime()
+        self.anime_list = []
+        self.anime_next = None
+        # Weekly playlist: schedule grouped per day once per data load, day frames built once
+        self.anime_by_day = None
+        self.date_widget = dict()
+        self.playlist_loaded = False
+        # Title index behind the search box, updated in place on every reload
+        self.search_index = SearchIndex()
+        self.search_hits = []
 
         # Load images with light and dark mode image
         image_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "test_images")
@@ -62,7 +108,7 @@ class App(customtkinter.CTk):
         # Create navigation frame
         self.navigation_frame = customtkinter.CTkFrame(self, corner_radius=0)
         self.navigation_frame.grid(row=0, column=0, sticky="nsew")
-        self.navigation_frame.grid_rowconfigure(4, weight=1)
+        self.navigation_frame.grid_rowconfigure(5, weight=1)
 
         self.navigation_frame_label = customtkinter.CTkLabel(self.navigation_frame, text="  Arc Demo", image=self.logo_image,
                                                              compound="left", font=customtkinter.CTkFont(size=15, weight="bold"))
@@ -83,6 +129,23 @@ class App(customtkinter.CTk):
                                                       image=self.add_user_image, anchor="w", command=self.frame_3_button_event)
         self.frame_3_button.grid(row=3, column=0, sticky="ew")
 
+        self.search_var = customtkinter.StringVar()
+        self.search_var.trace_add("write", lambda *_: self.update_search_results())
+        self.search_entry = customtkinter.CTkEntry(self.navigation_frame, placeholder_text="Search anime",
+                                                   textvariable=self.search_var)
+        self.search_entry.grid(row=4, column=0, padx=10, pady=(10, 0), sticky="ew")
+        self.search_entry.bind("<Return>", lambda _: self.open_search_result(0))
+
+        self.search_frame = customtkinter.CTkFrame(self.navigation_frame, corner_radius=0, fg_color="transparent")
+        self.search_frame.grid(row=5, column=0, padx=10, sticky="new")
+        self.search_buttons = []
+        for i in range(SEARCH_RESULT_LIMIT):
+            button = customtkinter.CTkButton(self.search_frame, corner_radius=0, height=28, text="", anchor="w",
+                                             fg_color="transparent", text_color=("gray10", "gray90"),
+                                             hover_color=("gray70", "gray30"),
+                                             command=lambda i=i: self.open_search_result(i))
+            self.search_buttons.append(button)
+
         self.appearance_mode_menu = customtkinter.CTkOptionMenu(self.navigation_frame, values=["Light", "Dark", "System"],
                                                                 command=self.change_appearance_mode_event)
         self.appearance_mode_menu.grid(row=6, column=0, padx=20, pady=20, sticky="s")
@@ -108,21 +171,24 @@ class App(customtkinter.CTk):
         self.home_buttons_frame = customtkinter.CTkScrollableFrame(self.home_frame, label_text="Anime List")
         self.home_buttons_frame.grid(row=0, column=2, rowspan=3, padx=(20, 0), pady=(20, 0), sticky="nsew")
         self.home_buttons_frame.grid_columnconfigure(0, weight=1)
-        self.anime_next = self.upcoming_anime() if self.upcoming_anime() else {"name": "No upcoming anime", "image_url": ""}
-
-        self.upcoming_anime_btn = customtkinter.CTkButton(
-            self.home_frame,
-            text=self.split_text(self.anime_next["name"]),
-            image=self.get_img(self.anime_next["image_url"]) if self.anime_next["image_url"] else None,
-            command=lambda: self.open_web(self.anime_next["name"])
-        )
+
+        # Placeholder until the schedule arrives from the startup worker
+        self.upcoming_anime_btn = customtkinter.CTkButton(self.home_frame, text="Loading anime...",
+                                                          command=self.open_upcoming_web)
         self.upcoming_anime_btn.grid(row=3, column=2, padx=10, pady=10)
-        thread1 = Thread(target=self.get_anime_list_display, args=())
-        thread1.start()
 
         # Select default frame
         self.select_frame_by_name("home")
         self.check_time()
+
+        # Staged startup: the window paints first, data and art are fetched by a worker
+        self.process_ui_queue()
+        Thread(target=self.load_startup_data, daemon=True).start()
+        Thread(target=self.prepare_portraits, daemon=True).start()
+        if SCHEDULE_URL:
+            self.after(SCHEDULE_RELOAD_MS, self.reload_schedule)
+        self.after(BROWSER_WARM_UP_MS, self.start_browser)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
 
 
@@ -140,93 +206,199 @@ class App(customtkinter.CTk):
             print("Error: config.json contains invalid JSON.")
         return None
 
-    def to_local_time(self, anime_time, anime_timezone, date_of_week):
-        """Convert the anime's scheduled time and day to local time and day."""
-        # Parse the anime's time
-        anime_hour, anime_minute = map(int, anime_time.split(':'))
-        
-        # Get the anime's timezone
-        anime_tz = pytz.timezone(anime_timezone)
-        
-        # Create a datetime object for the given day of the week in the anime's timezone
-        anime_datetime = datetime.datetime.now(anime_tz).replace(
-            hour=anime_hour, minute=anime_minute, second=0, microsecond=0
-        )
-        anime_datetime += datetime.timedelta(days=abs(date_of_week - anime_datetime.weekday()) % 7)
-        
-        # Convert to local timezone
-        local_time = anime_datetime.astimezone()  # Convert to the system's local timezone
-        local_day = (date_of_week + (local_time.date() - anime_datetime.date()).days) % 7
-
-        return local_day, local_time.strftime('%H:%M')
-    
-    def get_anime_list_from_db(self):
+    def get_anime_list_from_db(self, search_documents=None):
         """Fetch anime list from the database, converting scheduled times and days to local time and day."""
+        if SCHEDULE_URL:
+            # The schedule service has already read and localized the collection
+            with tracer.span("service.load", "io"):
+                return fetch_schedule(SCHEDULE_URL, search_documents)
         client = MongoClient(self.mongodb_uri)
         db = client['anime_db']
         collection = db['anime_collection']
-        
-        anime_list = []
-        for anime in collection.find({}):
-            for lang in ["chs", "cht"]:
-                details = anime.get("translations", {}).get(lang)
-                if details:
-                    # Convert anime day and time to local values
-                    local_day, local_time = self.to_local_time(
-                        details.get("time", "00:00"),
-                        details.get("timezone", "UTC"),
-                        details.get("day", 0)  # Default to 0 (Monday) if no day is specified
-                    )
-                    anime_list.append({
-                        "name": details.get("name", "Unnamed Anime"),
-                        "day": local_day,  # Local day of the week (0 = Monday, 6 = Sunday)
-                        "local_time": local_time,  # Local time as a string
-                        "timezone": details.get("timezone"),
-                        "image_url": details.get("image_url"),
-                        "language": lang
-                    })
-
-        anime_list.sort(key=lambda x: (x["day"], x["local_time"]))  # Sort by day and time
-
-        return anime_list
+        with tracer.span("db.load", "io"):
+            return load_schedule(collection, search_documents=search_documents)
+
+    def run_on_ui(self, callback, *args):
+        """Queue a callback to run on the Tk thread, safe to call from any thread."""
+        self.ui_queue.put((callback, args))
+
+    def process_ui_queue(self):
+        """Drain results posted by worker threads in batches, then poll again."""
+        for _ in range(UI_BATCH_SIZE):
+            try:
+                callback, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error handling background result: {e}")
+        # Come straight back while there is a backlog so Tk can still repaint between batches
+        self.after(1 if not self.ui_queue.empty() else 50, self.process_ui_queue)
+
+    def load_startup_data(self):
+        """Background stage of startup: fetch the schedule off the Tk thread."""
+        search_documents = {}
+        try:
+            anime_list = self.get_anime_list_from_db(search_documents)
+        except Exception as e:
+            print(f"Error loading anime: {e}")
+            # A failed refresh must not wipe the schedule that is already shown
+            self.run_on_ui(self.on_anime_list_failed)
+            return
+        self.run_on_ui(self.on_anime_list_loaded, anime_list)
+        self.run_on_ui(self.on_search_loaded, search_documents)
+
+    def reload_schedule(self):
+        """Pick up schedule service updates in the background."""
+        Thread(target=self.load_startup_data, daemon=True).start()
+        self.after(SCHEDULE_RELOAD_MS, self.reload_schedule)
+
+    def on_anime_list_loaded(self, anime_list):
+        # Periodic reloads of an unchanged schedule leave the widgets alone
+        if self.anime_by_day is not None and anime_list == self.anime_list:
+            return
+        self.anime_list = anime_list
+        self.anime_by_day = [entries_for_day(anime_list, day) for day in range(7)]
+        self.playlist_loaded = False
+        self.prefetched_day = None
+        self.check_next_anime()
+        for child in self.home_buttons_frame.winfo_children():
+            child.destroy()
+        self.get_anime_list_display()
+        # Fill the playlist now if it was opened while the schedule was still loading
+        if self.second_frame.winfo_ismapped():
+            self.load_anime_frame(self.second_frame)
+
+    def on_search_loaded(self, search_documents):
+        with tracer.span("search.index", "ui", documents=len(search_documents)):
+            self.search_index.update(search_documents)
+        self.update_search_results()
+
+    def update_search_results(self):
+        """Relabel the result buttons with the best matches for the search box text."""
+        with tracer.span("search.query", "ui"):
+            self.search_hits = self.search_index.search(self.search_var.get(), SEARCH_RESULT_LIMIT)
+        for row, button in enumerate(self.search_buttons):
+            if row < len(self.search_hits):
+                anime = self.search_hits[row]
+                button.configure(text=f"{DAY_ABBREVIATIONS[anime.day]} {anime.local_time}  {anime.name[:16]}")
+                button.grid(row=row, column=0, sticky="ew")
+            else:
+                button.grid_remove()
+
+    def open_search_result(self, row):
+        if row < len(self.search_hits):
+            self.open_web(self.search_hits[row].name)
+
+    def on_anime_list_failed(self):
+        # Only the very first load has nothing to keep showing
+        if self.anime_by_day is None:
+            self.upcoming_anime_btn.configure(text="No upcoming anime")
 
     def upcoming_anime(self):
         """Find the next upcoming anime scheduled for today or fallback to tomorrow, based on local time."""
-        current_time = datetime.datetime.now().time()  # Current local time
-
-        # Check for today's anime
-        anime_today = [anime for anime in self.anime_list if anime['day'] == self.day_of_week]
-        for anime in anime_today:
-            anime_hour, anime_minute = map(int, anime['local_time'].split(':'))
-            anime_time = datetime.time(anime_hour, anime_minute)
-            
-            # Compare the local times to find the next anime
-            if anime_time > current_time:
-                return anime
-        
-        # Fallback to the next day if no anime is left today
-        next_day = (self.day_of_week + 1) % 7
-        anime_next_day = [anime for anime in self.anime_list if anime['day'] == next_day]
-        return anime_next_day[0] if anime_next_day else None
+        return next_entry(self.anime_list)
 
     def check_next_anime(self):
         temp = self.upcoming_anime()
-        if temp and (temp != self.anime_next):
+        if temp is None:
+            # Once the schedule is in, nothing airing today or tomorrow replaces the startup text
+            if self.anime_by_day is not None and self.upcoming_anime_btn.cget("text") != "No upcoming anime":
+                self.anime_next = None
+                self.upcoming_anime_btn.configure(text="No upcoming anime")
+        elif temp != self.anime_next:
             self.anime_next = temp
-            self.upcoming_anime_btn.configure(text=self.split_text(self.anime_next['name']), 
-                                           image=self.get_img(self.anime_next['image_url']),
-                                           command=lambda: self.open_web(self.anime_next['name']))
+            self.upcoming_anime_btn.configure(text=self.split_text(self.anime_next.name))
+            # Cover art is downloaded by a worker and applied when it arrives
+            self.image_pool.submit(self.load_upcoming_image, temp)
+            # Warm the art of the one after it so the next switch is instant
+            following = next_entry(self.anime_list, temp.minute_of_week)
+            if following:
+                self.prefetch_pool.submit(self.prefetch_cover, following)
+
+    def load_upcoming_image(self, anime):
+        try:
+            image = self.cached_cover(anime.cover_url(100))
+        except Exception as e:
+            print(f"Error loading cover for {anime.name}: {e}")
+            return
+        self.run_on_ui(self.set_upcoming_image, anime, image)
+
+    def set_upcoming_image(self, anime, image):
+        # Drop stale results if the upcoming anime changed during the download
+        if anime == self.anime_next:
+            self.upcoming_anime_btn.configure(image=customtkinter.CTkImage(image, size=(100, 100)))
+
+    def open_upcoming_web(self):
+        if self.anime_next:
+            self.open_web(self.anime_next.name)
+
+    def cached_cover(self, url):
+        """Decoded 100x100 cover for url, downloaded only on a cache miss. Worker threads only."""
+        image = self.cover_cache.get(url)
+        if image is None:
+            image = self.fetch_image(url, (100, 100))
+            self.cover_cache[url] = image
+        return image
+
+    def prefetch_cover(self, anime):
+        if anime.image_url:
+            try:
+                self.cached_cover(anime.cover_url(100))
+            except Exception as e:
+                print(f"Error prefetching cover for {anime.name}: {e}")
+
+    def prefetch_tomorrow(self):
+        """Warm tomorrow's covers on the prefetch worker before midnight."""
+        tomorrow = (self.day_of_week + 1) % 7
+        if self.prefetched_day == tomorrow or not self.anime_by_day:
+            return
+        self.prefetched_day = tomorrow
+        for anime in self.anime_by_day[tomorrow]:
+            self.prefetch_pool.submit(self.prefetch_cover, anime)
+
+    def roll_over_day(self, today):
+        """Rebuild the home list for the new day, covers come from the warmed cache."""
+        self.day_of_week = today
+        for child in self.home_buttons_frame.winfo_children():
+            child.destroy()
+        if self.anime_by_day:
+            self.get_anime_list_display()
 
     def get_anime_list_display(self):
-        count = 0
-        self.anime_today = {}
-        for anime in self.anime_list:
-            if self.day_of_week == anime['day']:
-                self.anime_today[count] = customtkinter.CTkButton(self.home_buttons_frame, text=self.split_text(anime['name']),
-                                                                  image=self.get_img(anime['image_url']), compound="top",
-                                                                  command=lambda a=anime['name']: self.open_web(a))
-                self.anime_today[count].grid(row=count, column=0, padx=20, pady=10)
-                count += 1
+        self.load_anime_buttons(self.home_buttons_frame, self.anime_by_day[self.day_of_week])
+
+    def load_anime_buttons(self, frame, anime_list, show_time=False):
+        """Fetch covers on the worker pool, buttons are added to frame as each one is decoded."""
+        generation = self.frame_generations.get(frame, 0) + 1
+        self.frame_generations[frame] = generation
+        for row, anime in enumerate(anime_list):
+            self.image_pool.submit(self.produce_anime_button, frame, generation, row, anime, show_time)
+
+    def produce_anime_button(self, frame, generation, row, anime, show_time):
+        # Worker side: never touch Tk here, only hand the decoded image to the consumer
+        image = None
+        if anime.image_url:
+            try:
+                image = self.cached_cover(anime.cover_url(100))
+            except Exception as e:
+                print(f"Error loading cover for {anime.name}: {e}")
+        self.run_on_ui(self.add_anime_button, frame, generation, row, anime, image, show_time)
+
+    @tracer.traced("card.build", "ui")
+    def add_anime_button(self, frame, generation, row, anime, image, show_time):
+        # Still in flight when the frame was rebuilt, the new load has its own button
+        if generation != self.frame_generations.get(frame):
+            return None
+        text = self.split_text(anime.name)
+        if show_time:
+            text += '\n' + anime.local_time
+        button = customtkinter.CTkButton(frame, text=text,
+                                         image=customtkinter.CTkImage(image, size=(100, 100)) if image else self.anime_image,
+                                         compound="top", command=lambda a=anime.name: self.open_web(a))
+        button.grid(row=row, column=0, padx=20, pady=10)
+        return button
 
     def change_char(self):
         """Switch to the next character, stopping any currently playing sound first."""
@@ -236,41 +408,45 @@ class App(customtkinter.CTk):
         # Cycle through characters
         self.char_pos = (self.char_pos + 1) % len(self.char_list)
         
-        # Update character image
-        old_image = Image.open(os.path.join(self.char_path, self.get_cur_char() + ".png"))
-        im_size = old_image.size
-        new_size = max(im_size)
-        background = (new_size, new_size)
-        location = ((new_size - im_size[0]) // 2, (new_size - im_size[1]) // 2)
-        new_image = Image.new('RGBA', background, (0, 0, 0, 0))
-        new_image.paste(old_image, location)
-        
         # Display the updated character image
-        image_char = customtkinter.CTkImage(new_image, size=(200, 200))
-        self.home_frame_large_image_label.configure(image=image_char)
+        self.show_cur_char()
 
         # Play character intro sound if enabled
         if self.kantai_is_start:
             self.play_sound("_Intro")
 
     def switch_back_char(self):
-         #get correct size of image to be a square   
-        old_image = Image.open(os.path.join(self.char_path, self.get_cur_char()+".png" ))
-        im_size = old_image.size
-        if im_size[0]>im_size[1]:
-            new_w = im_size[0]
-            background = (new_w,new_w)
-            location = (0,int((new_w-im_size[1])/2))
-        else:
-            new_h = im_size[1]
-            background = (new_h,new_h)
-            location = (int((new_h-im_size[0])/2),0)
-        new_image = Image.new('RGBA', background, (0, 0, 0, 0))
-        new_image.paste(old_image,location )
+        self.show_cur_char()
 
-        #output image to update on home screen
-        image_char = customtkinter.CTkImage(new_image, size=(200, 200))
-        self.home_frame_large_image_label.configure(image=image_char)
+    #Pad a character image to a transparent square and scale it to display size
+    def square_portrait(self, name):
+        old_image = Image.open(os.path.join(self.char_path, name + ".png"))
+        im_size = old_image.size
+        new_size = max(im_size)
+        location = ((new_size - im_size[0]) // 2, (new_size - im_size[1]) // 2)
+        new_image = Image.new('RGBA', (new_size, new_size), (0, 0, 0, 0))
+        new_image.paste(old_image, location)
+        return new_image.resize(CHAR_SIZE, Image.LANCZOS)
+
+    #Prepare every portrait once in the background so switching never hits the disk
+    def prepare_portraits(self):
+        for name in self.char_list:
+            try:
+                self.run_on_ui(self.add_portrait, name, self.square_portrait(name))
+            except Exception as e:
+                print(f"Error preparing portrait for {name}: {e}")
+
+    def add_portrait(self, name, image):
+        if name not in self.char_images:
+            self.char_images[name] = customtkinter.CTkImage(image, size=CHAR_SIZE)
+
+    #output current character image to the home screen
+    def show_cur_char(self):
+        name = self.get_cur_char()
+        if name not in self.char_images:
+            # Clicked before the background pass reached this character
+            self.add_portrait(name, self.square_portrait(name))
+        self.home_frame_large_image_label.configure(image=self.char_images[name])
 
     #Start or shut down kantain clock
     def start_kantai(self):
@@ -279,8 +455,9 @@ class App(customtkinter.CTk):
         if self.kantai_is_start:
             # Play the start sound and update character image
             sound_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Sounds")
-            self.current_sound = vlc.MediaPlayer(os.path.join(sound_path, "TitleCallA" + str(randint(1, 20)) + ".mp3"))
-            self.current_sound.play()
+            with tracer.span("audio.start", "audio"):
+                self.current_sound = vlc.MediaPlayer(os.path.join(sound_path, "TitleCallA" + str(randint(1, 20)) + ".mp3"))
+                self.current_sound.play()
             self.switch_back_char()
         else:
             # Stop all sounds if Kantai mode is turned off
@@ -304,15 +481,20 @@ class App(customtkinter.CTk):
         if self.kantai_is_start:
             if self.current_sound:
                 self.current_sound.stop()  # Stop any currently playing sound
-            self.current_sound = vlc.MediaPlayer(os.path.join(sound_path, self.get_cur_char() + keyword + ".mp3"))
-            self.current_sound.play()
+            with tracer.span("audio.start", "audio"):
+                self.current_sound = vlc.MediaPlayer(os.path.join(sound_path, self.get_cur_char() + keyword + ".mp3"))
+                self.current_sound.play()
     
     #Update Time based on current PC time on home screen        
     def check_time(self):
         self.clock_label.configure(text=datetime.datetime.now().replace(microsecond=0))
         current_time = datetime.datetime.now()
         self.clock_label.after(1000, self.check_time)
-        self.day_of_week = datetime.date.today().weekday()
+        today = current_time.weekday()
+        if today != self.day_of_week:
+            self.roll_over_day(today)
+        elif current_time.hour >= PREFETCH_FROM_HOUR:
+            self.prefetch_tomorrow()
         self.check_next_anime()
         if current_time.minute == 0 and current_time.second == 0:
             self.play_sound(str(current_time.hour))
@@ -322,28 +504,56 @@ class App(customtkinter.CTk):
    
 
     #Open website on click for anime list
-    def open_web(self,keyword):
-        webbrowser.open_new("https://www.iyf.tv/search/"+keyword)
+    def start_browser(self):
+        """Import CEF and warm the in-app browser, kept off the startup path."""
+        try:
+            import web_widget
+        except ImportError:
+            # cefpython3 is optional, pages open in the system browser without it
+            return
+        self.browser_service = web_widget.BrowserService(self)
+        self.browser_service.warm_up()
 
-    #Get_img from URL
-    def get_img(self,url,x=100,y =100):
-        image = customtkinter.CTkImage(Image.open(requests.get(url, stream=True).raw), size=(x, y))
+    def open_web(self,keyword):
+        url = "https://www.iyf.tv/search/"+keyword
+        if self.browser_service:
+            try:
+                self.browser_service.open(url)
+                return
+            except Exception as e:
+                print(f"Error opening in-app browser: {e}")
+        webbrowser.open_new(url)
+
+    #Download and decode an image from URL, safe to call from worker threads
+    @tracer.traced("image.fetch", "io")
+    def fetch_image(self,url,size=None):
+        # Same cover timeout as the PyQt client, a stalled host must not hold a pool worker
+        image = Image.open(requests.get(url, stream=True, timeout=5).raw)
+        if size:
+            # Shrink on the worker, keep 2x headroom for display scaling
+            image.thumbnail((size[0] * 2, size[1] * 2))
+        else:
+            image.load()
         return image
-    
+
     def split_text(self,text):
         length = len(text)
         new_text ='\n'.join(text[i:i+10] for i in range(0, length, 10))
         return new_text
     
-    #load anime frame into desired frame
+    #load anime frame into desired frame, reusing what was built on earlier visits
     def load_anime_frame(self,frame):
-        self.date_widget =dict()
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        self.date_widget = self.list_to_widgets(days,frame,0)
+        if not self.date_widget:
+            days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            self.date_widget = self.list_to_widgets(days,frame,0)
+        # Buttons are generated once per data load
+        if self.playlist_loaded or self.anime_by_day is None:
+            return
+        self.playlist_loaded = True
         for day in range(0,7):
-            list_anime = [sublist for sublist in self.anime_list if sublist[1] == day]
-            thread3 = Thread(target = self.generate_anime_list,args=(list_anime,self.date_widget[day]))
-            thread3.start()
+            for child in self.date_widget[day].winfo_children():
+                child.destroy()
+            self.generate_anime_list(self.anime_by_day[day],self.date_widget[day])
     
     #generate a list of widgets and output as a dictionary
     def list_to_widgets(self,list,frame,row):
@@ -356,31 +566,11 @@ class App(customtkinter.CTk):
             col +=1
         return list_widget
     
-    #generate a list of widgets in given tk frame by name from given list [name, day, time, img]
+    #generate a list of anime buttons with airing time in given tk frame
     def generate_anime_list(self,list,frame):
-        count = 0
-        self.list_buttons = dict()
-        for elements in list:
-            #initialize the buttons and connect callback function to open relative webpage. 
-            self.list_buttons[count]=customtkinter.CTkButton(frame, text=self.split_text(elements[0])+ '\n' + elements[2], 
-                                                           image=self.get_img(elements[3]), compound="top",
-                                                           command=lambda a = elements[0]: self.open_web(a ))
-            self.list_buttons[count].grid(row=count, column=0, padx=20, pady=10)
-            count +=1
-
-    #genearate button list for anime of the day !!!! NEED TO change to more general use
-    def get_anime_list(self):
-        count = 0
-        self.anime_today = dict()
-        for anime in self.anime_list:
-            if self.day_of_week == anime[1]:
-                #initialize the buttons and connect callback function to open relative webpage. 
-                self.anime_today[count]=customtkinter.CTkButton(self.home_buttons_frame, text=self.split_text(anime[0]), 
-                                                           image=self.get_img(anime[3]), compound="top",
-                                                           command=lambda a = anime[0]: self.open_web(a ))
-                self.anime_today[count].grid(row=count, column=0, padx=20, pady=10)
-                count +=1
+        self.load_anime_buttons(frame, list, show_time=True)
    
+    @tracer.traced("page.switch", "ui")
     def select_frame_by_name(self, name):
         # set button color for selected button
         self.home_button.configure(fg_color=("gray75", "gray25") if name == "home" else "transparent")
@@ -410,8 +600,7 @@ class App(customtkinter.CTk):
     def frame_2_button_event(self):
         self.select_frame_by_name("frame_2")
         self.geometry("1000x850")
-        thread2 = Thread(target = self.load_anime_frame,args=(self.second_frame,))
-        thread2.start()
+        self.load_anime_frame(self.second_frame)
 
     def frame_3_button_event(self):
         self.select_frame_by_name("frame_3")
@@ -422,8 +611,21 @@ class App(customtkinter.CTk):
     def change_appearance_mode_event(self, new_appearance_mode):
         customtkinter.set_appearance_mode(new_appearance_mode)
 
+    def on_close(self):
+        # Drop queued cover downloads so exit doesn't wait on the network
+        self.image_pool.shutdown(wait=False, cancel_futures=True)
+        self.prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        if self.browser_service:
+            # The root must outlive the browser until CEF has finished closing it
+            self.browser_service.close(self.destroy)
+        else:
+            self.destroy()
+
 
 if __name__ == "__main__":
+    tracer.start()
     app = App()
     app.mainloop()
+    if app.browser_service:
+        app.browser_service.shutdown()
     _logging.debug("Main loop exited")
\ No newline at end of file
@@ -1,122 +1,389 @@
 import sys
+import time
+
+# Reference point for the startup report
+_startup_t0 = time.perf_counter()
+
 import os
 import datetime
-import requests
+import importlib
 import json
-import pytz
-import vlc
 from random import randint
 import webbrowser
-from threading import Thread
+from threading import Thread, Event, Lock
+from collections import OrderedDict
 import logging as _logging
-from pymongo import MongoClient
+from anime_schedule import load_schedule, entries_for_day, next_entry
+from anime_search import SearchIndex
+from perf_trace import tracer
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QPushButton, QLabel, QFrame, QScrollArea,
-                              QGridLayout, QComboBox, QSplitter, QSizePolicy)
-from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal, QSize, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QPixmap, QFont, QIcon, QPalette, QColor
+                              QGridLayout, QComboBox, QSplitter, QSizePolicy,
+                              QLineEdit, QListWidget, QListWidgetItem)
+from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal, QSize, QRectF, QUrl
+from PyQt5.QtGui import (QPixmap, QImage, QPainter, QPainterPath, QLinearGradient, QFont,
+                         QIcon, QPalette, QColor)
+from stall_watchdog import StallWatchdog, threshold_from_environment
+
+SEARCH_URL = "https://www.iyf.tv/search/"
+# Same variable schedule_service reads. It is read here so the service client
+# (http.server, urllib) is only imported when a service is configured.
+SCHEDULE_URL = os.environ.get("ARC_SCHEDULE_URL", "").rstrip("/")
+# A configured schedule service is revalidated this often, unchanged schedules cost a 304
+SCHEDULE_RELOAD_MS = 5 * 60 * 1000
+SEARCH_RESULT_LIMIT = 20
+DAY_ABBREVIATIONS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+# One stylesheet for the whole window, widgets pick their rules up by object name.
+# Qt parses it once, so building cards or switching pages does not re-parse CSS.
+APP_STYLESHEET = """
+    QFrame#nav_frame, #nav_frame QLabel {
+        background-color: #2b2b2b;
+    }
+    QLabel#nav_title {
+        color: white;
+    }
+    QPushButton#nav_button {
+        background-color: transparent;
+        color: white;
+        text-align: left;
+        padding: 10px;
+        border: none;
+    }
+    QPushButton#nav_button:hover {
+        background-color: #404040;
+    }
+    QPushButton#nav_button:pressed, QPushButton#nav_button[active="true"] {
+        background-color: #505050;
+    }
+    QLineEdit#nav_search {
+        background-color: #404040;
+        color: white;
+        border: 1px solid #505050;
+        border-radius: 5px;
+        padding: 6px;
+    }
+    QListWidget#search_results {
+        background-color: #333333;
+        color: white;
+        border: none;
+    }
+    QListWidget#search_results::item:hover, QListWidget#search_results::item:selected {
+        background-color: #505050;
+    }
+    QLabel#clock_label {
+        color: #333;
+        background-color: #f0f0f0;
+        padding: 10px;
+        border-radius: 5px;
+        margin: 5px;
+    }
+    QLabel#character_label {
+        border: 2px solid #ddd;
+        border-radius: 20px;
+        padding: 20px;
+        background-color: white;
+        min-width: 540px;
+        min-height: 540px;
+    }
+    QPushButton#start_kantai_button, QPushButton#next_char_button {
+        color: white;
+        border: none;
+        padding: 10px;
+        border-radius: 5px;
+        font-weight: bold;
+    }
+    QPushButton#start_kantai_button {
+        background-color: #4CAF50;
+    }
+    QPushButton#start_kantai_button:hover {
+        background-color: #45a049;
+    }
+    QPushButton#next_char_button {
+        background-color: #2196F3;
+    }
+    QPushButton#next_char_button:hover {
+        background-color: #1976D2;
+    }
+    QLabel#section_title {
+        color: #333;
+        padding: 5px;
+        background-color: #f8f9fa;
+        border-radius: 5px;
+        border-left: 4px solid #007bff;
+    }
+    QScrollArea#anime_scroll {
+        border: 2px solid #ddd;
+        border-radius: 10px;
+        background-color: white;
+    }
+    #anime_scroll QScrollBar:vertical {
+        background-color: #f0f0f0;
+        width: 12px;
+        border-radius: 6px;
+    }
+    #anime_scroll QScrollBar::handle:vertical {
+        background-color: #c0c0c0;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    #anime_scroll QScrollBar::handle:vertical:hover {
+        background-color: #a0a0a0;
+    }
+    QLabel#placeholder_label {
+        color: gray;
+        font-style: italic;
+        padding: 20px;
+        background-color: #f9f9f9;
+        border-radius: 8px;
+        margin: 10px;
+    }
+    QPushButton#upcoming_anime_btn {
+        padding: 12px;
+        background-color: #28a745;
+        color: white;
+        border: none;
+        border-radius: 8px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#upcoming_anime_btn:hover {
+        background-color: #218838;
+    }
+    QLabel#add_person_label {
+        font-size: 24px;
+        color: #333;
+        padding: 50px;
+    }
+"""
+
+DARK_STYLESHEET = """
+    QMainWindow, QWidget {
+        background-color: #2b2b2b;
+        color: white;
+    }
+"""
+
+
+def app_stylesheet(mode):
+    """Window stylesheet for an appearance mode, the dark rules sit under the widget rules."""
+    if mode == "Dark":
+        return DARK_STYLESHEET + APP_STYLESHEET
+    return APP_STYLESHEET
+
+# Heavy modules (vlc, pymongo, requests, pytz, QtWebEngine) are imported on first
+# use through lazy_import. Pass --startup-report or set ARC_STARTUP_REPORT=1 to
+# print how long each startup stage and deferred import took.
+STARTUP_REPORT = "--startup-report" in sys.argv or bool(os.environ.get("ARC_STARTUP_REPORT"))
+_startup_marks = []
+_import_times = []
+
+def mark_startup(label):
+    """Record a startup milestone for the startup report"""
+    _startup_marks.append((label, time.perf_counter()))
+    tracer.instant(label, "startup")
+
+def lazy_import(name):
+    """Import a module on first use, timing the import for the startup report"""
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _import_times.append((name, time.perf_counter() - start))
+    return module
+
+def print_startup_report():
+    """Print startup milestones and deferred import costs, -X importtime style"""
+    print("Arc startup report (ms since Main_pyqt import)", file=sys.stderr)
+    for label, stamp in _startup_marks:
+        print(f"{(stamp - _startup_t0) * 1000:10.1f} | {label}", file=sys.stderr)
+    print("Deferred imports (ms, paid on first use)", file=sys.stderr)
+    for name, seconds in _import_times:
+        print(f"{seconds * 1000:10.1f} | {name}", file=sys.stderr)
+
+mark_startup("module imports")
+
+class SearchBrowser:
+    """Single warm in-app browser reused for every anime search page"""
+    def __init__(self):
+        self.view = None
+        
+    def warm_up(self):
+        """Create the web view ahead of time, call once the main window is up"""
+        if self.view is None:
+            try:
+                QWebEngineView = lazy_import("PyQt5.QtWebEngineWidgets").QWebEngineView
+            except ImportError:
+                # PyQtWebEngine is optional, pages open in the system browser without it
+                return
+            self.view = QWebEngineView()
+            self.view.setWindowTitle("Arc")
+            self.view.resize(1024, 720)
+            self.view.load(QUrl("about:blank"))
+            
+    def open(self, keyword):
+        """Navigate the warm browser to the search page for keyword"""
+        url = SEARCH_URL + keyword
+        self.warm_up()
+        if self.view is None:
+            webbrowser.open_new(url)
+            return
+        self.view.load(QUrl(url))
+        self.view.show()
+        self.view.raise_()
+        self.view.activateWindow()
+        
+    def close(self):
+        if self.view is not None:
+            self.view.close()
+            self.view.deleteLater()
+            self.view = None
+
+search_browser = SearchBrowser()
+
+# Decoded covers shared by every card, warmed ahead of the day rollover
+COVER_CACHE_SIZE = 512
+# From this hour on, tomorrow's covers are prefetched in the background
+PREFETCH_FROM_HOUR = 21
+
+class CoverCache:
+    """Bounded LRU of card-ready cover QImages, safe to fill from worker threads"""
+    def __init__(self, capacity=COVER_CACHE_SIZE):
+        self.capacity = capacity
+        self.images = OrderedDict()
+        self.lock = Lock()
+        
+    def get(self, url):
+        with self.lock:
+            image = self.images.get(url)
+            if image is not None:
+                self.images.move_to_end(url)
+            return image
+        
+    def put(self, url, image):
+        with self.lock:
+            self.images[url] = image
+            self.images.move_to_end(url)
+            while len(self.images) > self.capacity:
+                self.images.popitem(last=False)
+                
+    def __contains__(self, url):
+        with self.lock:
+            return url in self.images
+
+cover_cache = CoverCache()
+
+def fetch_cover(url, face):
+    """Download a cover cropped to a face x face QImage, None if it fails.
+    
+    Only uses QImage so it is safe to call outside the GUI thread.
+    """
+    with tracer.span("image.fetch", "io"):
+        response = lazy_import("requests").get(url, timeout=5)
+    if response.status_code != 200:
+        return None
+    with tracer.span("image.decode", "ui"):
+        image = QImage.fromData(response.content)
+    if image.isNull():
+        return None
+    image = image.scaled(face, face, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    return image.copy((image.width() - face) // 2, (image.height() - face) // 2, face, face)
+
+def card_font(pixel_size):
+    font = QFont("Roboto")
+    font.setPixelSize(pixel_size)
+    font.setWeight(QFont.Medium)
+    return font
+
+
+class CardAnimator:
+    """Animates hover elevation, click feedback and fade-in for every AnimeCard.
+
+    One timer drives all cards. Cards only keep their current and target values
+    and paint themselves from them, so no per-card timers or graphics effects.
+    The timer stops as soon as no card is moving.
+    """
+    FRAME_MS = 16
+    STAGGER_MS = 60
+    # Cards past this index fade in together instead of waiting their turn
+    MAX_STAGGERED = 12
+
+    def __init__(self):
+        # Created on first use, Qt timers need the QApplication to exist
+        self.timer = None
+        self.cards = set()
+        self.last_tick = 0.0
+
+    def animate(self, card):
+        """Keep ticking until the card reaches its targets"""
+        self.cards.add(card)
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setInterval(self.FRAME_MS)
+            self.timer.timeout.connect(self.tick)
+        if not self.timer.isActive():
+            self.last_tick = time.perf_counter()
+            self.timer.start()
+
+    def fade_in(self, card, index=0):
+        """Fade a new card in, staggered by its position in the list"""
+        delay = min(index, self.MAX_STAGGERED) * self.STAGGER_MS / 1000.0
+        card.fade = 0.0
+        card.fade_start = time.perf_counter() + delay
+        self.animate(card)
+
+    def tick(self):
+        now = time.perf_counter()
+        elapsed = now - self.last_tick
+        self.last_tick = now
+        for card in list(self.cards):
+            try:
+                moving = card.step(now, elapsed)
+            except RuntimeError:
+                # The card was deleted while animating
+                moving = False
+            if not moving:
+                self.cards.discard(card)
+        if not self.cards:
+            self.timer.stop()
+
+
+card_animator = CardAnimator()
+
 
 class AnimeCard(QFrame):
-    """Custom widget for displaying anime information with full-image background"""
+    """Custom widget for displaying anime information with full-image background.
+
+    The card paints its cover, overlay, text and shadow itself in paintEvent,
+    which keeps hover and fade animation a plain repaint.
+    """
+    SIZE = 200
+    MARGIN = 8
+    FACE = SIZE - 2 * MARGIN
+    RADIUS = 8
+    FADE_SECONDS = 0.3
+    ELEVATION_SECONDS = 0.2
+    # Elevation levels: 0 resting, 1 hovered, PRESSED briefly on click
+    PRESSED = 0.4
+    fonts = None
+
+    @tracer.traced("card.build", "ui")
     def __init__(self, anime_data, parent=None):
         super().__init__(parent)
         self.anime_data = anime_data
+        self.cover = None
+        self.elevation = 0.0
+        self.elevation_target = 0.0
+        self.fade = 1.0
+        self.fade_start = 0.0
         self.setup_ui()
         
     def setup_ui(self):
         """Setup the anime card UI with Material Design principles"""
-        self.setFixedSize(200, 200)  # Changed to 1:1 ratio
+        self.setFixedSize(self.SIZE, self.SIZE)  # Changed to 1:1 ratio
         self.setFrameStyle(QFrame.NoFrame)
-        # Initial Material Design elevation
-        self.setStyleSheet("""
-            QFrame {
-                border-radius: 8px;
-                margin: 8px;
-                background: white;
-                border: none;
-            }
-        """)
-        
-        # Main layout with overlay
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-        
-        # Background image container
-        self.bg_label = QLabel()
-        self.bg_label.setFixedSize(200, 200)  # Changed to 1:1 ratio
-        self.bg_label.setScaledContents(True)
-        self.bg_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(self.bg_label)
-        
-        # Overlay for text information
-        self.overlay_widget = QWidget()
-        self.overlay_widget.setFixedSize(200, 200)  # Changed to 1:1 ratio
-        self.overlay_widget.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 rgba(0,0,0,0.2), stop:0.4 rgba(0,0,0,0.4), stop:1 rgba(0,0,0,0.7));
-                border-radius: 8px;
-            }
-        """)
-        
-        overlay_layout = QVBoxLayout(self.overlay_widget)
-        overlay_layout.setContentsMargins(12, 8, 12, 8)
-        overlay_layout.setSpacing(4)
-        
-        # Title
-        self.title_label = QLabel(self.anime_data.get('name', 'Unknown Anime'))
-        self.title_label.setWordWrap(True)
-        self.title_label.setStyleSheet("""
-            QLabel {
-                font-weight: 500;
-                font-size: 18px;
-                color: white;
-                background: transparent;
-                line-height: 1.3;
-                font-family: 'Roboto', sans-serif;
-            }
-        """)
-        overlay_layout.addWidget(self.title_label)
-        
-        # Time and language info
-        info_layout = QHBoxLayout()
-        
-        # Time
-        time_text = f"{self.anime_data.get('local_time', '00:00')}"
-        self.time_label = QLabel(time_text)
-        self.time_label.setStyleSheet("""
-            QLabel {
-                color: #FFD700;
-                font-size: 16px;
-                font-weight: 500;
-                background: transparent;
-                font-family: 'Roboto', sans-serif;
-            }
-        """)
-        info_layout.addWidget(self.time_label)
-        
-        info_layout.addStretch()
-        
-        # Language
-        lang_text = f"{self.anime_data.get('language', 'Unknown').upper()}"
-        self.lang_label = QLabel(lang_text)
-        self.lang_label.setStyleSheet("""
-            QLabel {
-                color: #87CEEB;
-                font-size: 14px;
-                font-weight: 500;
-                background: transparent;
-                font-family: 'Roboto', sans-serif;
-            }
-        """)
-        info_layout.addWidget(self.lang_label)
-        
-        overlay_layout.addLayout(info_layout)
-        overlay_layout.addStretch()
-        
-        # Add overlay to main layout
-        layout.addWidget(self.overlay_widget)
+        if AnimeCard.fonts is None:
+            AnimeCard.fonts = (card_font(18), card_font(16), card_font(14), card_font(24))
         
         # Make the card clickable
         self.setCursor(Qt.PointingHandCursor)
@@ -125,146 +392,124 @@ class AnimeCard(QFrame):
         # Load the background image
         self.load_background_image()
         
-        # Setup animations
-        self.setup_animations()
-        
     def load_background_image(self):
         """Load the anime background image"""
-        image_url = self.anime_data.get('image_url', '')
+        image_url = self.anime_data.cover_url(200)
         if image_url:
-            try:
-                # Download and display the image
-                response = requests.get(image_url, timeout=5)
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(response.content)
-                    if not pixmap.isNull():
-                        pixmap = pixmap.scaled(200, 200, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                        self.bg_label.setPixmap(pixmap)
-                        return
-            except Exception:
-                pass
-        
-        # Fallback: show a Material Design gradient background
-        self.bg_label.setStyleSheet("""
-            QLabel {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #2196F3, stop:1 #1976D2);
-                border-radius: 8px;
-            }
-        """)
-        self.bg_label.setText("ANIME")
-        self.bg_label.setStyleSheet(self.bg_label.styleSheet() + """
-            QLabel {
-                font-size: 24px;
-                color: white;
-                font-weight: 500;
-                font-family: 'Roboto', sans-serif;
-            }
-        """)
+            # Covers warmed by the prefetcher paint without touching the network
+            image = cover_cache.get(image_url)
+            if image is not None:
+                self.cover = QPixmap.fromImage(image)
+            else:
+                # Downloaded off the GUI thread, set_cover applies it on arrival
+                cover_loader.request(image_url, self)
+        # Without a cover the card paints a Material Design gradient instead
+    
+    def set_cover(self, image):
+        self.cover = QPixmap.fromImage(image)
+        self.update()
+    
+    def step(self, now, elapsed):
+        """Advance fade and elevation, returns True while still animating"""
+        changed = False
+        if self.fade < 1.0 and now >= self.fade_start:
+            self.fade = min(1.0, (now - self.fade_start) / self.FADE_SECONDS)
+            changed = True
+        if self.elevation != self.elevation_target:
+            delta = elapsed / self.ELEVATION_SECONDS
+            if self.elevation < self.elevation_target:
+                self.elevation = min(self.elevation_target, self.elevation + delta)
+            else:
+                self.elevation = max(self.elevation_target, self.elevation - delta)
+            changed = True
+        if changed:
+            self.update()
+        return self.fade < 1.0 or self.elevation != self.elevation_target
     
-    def setup_animations(self):
-        """Setup hover and click animations for the card following Material Design"""
-        # Elevation animation for Material Design shadow effect
-        self.elevation_animation = QPropertyAnimation(self, b"geometry")
-        self.elevation_animation.setDuration(200)
-        self.elevation_animation.setEasingCurve(QEasingCurve.OutCubic)
-        
-        # Store original geometry and style
-        self.original_geometry = self.geometry()
-        self.original_style = self.styleSheet()
-        
-        # Material Design elevation levels (PyQt5 compatible)
-        self.elevation_1 = """
-            QFrame {
-                border-radius: 8px;
-                margin: 8px;
-                background: white;
-                border: none;
-            }
-        """
-        
-        self.elevation_4 = """
-            QFrame {
-                border-radius: 8px;
-                margin: 8px;
-                background: white;
-                border: none;
-            }
-        """
-        
-        self.elevation_8 = """
-            QFrame {
-                border-radius: 8px;
-                margin: 8px;
-                background: white;
-                border: none;
-            }
-        """
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        # OutCubic easing for both fade and elevation
+        painter.setOpacity(1 - (1 - self.fade) ** 3)
+        lift = 1 - (1 - self.elevation) ** 3
+        
+        face = QRectF(self.rect()).adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        face.translate(0, -2 * lift)
+        
+        # Shadow: a few widening translucent layers stand in for a blur
+        painter.setPen(Qt.NoPen)
+        offset = 1 + 5 * lift
+        for layer in range(1, 4):
+            spread = layer * (1 + 1.5 * lift)
+            painter.setBrush(QColor(0, 0, 0, int((24 + 26 * lift) / layer)))
+            painter.drawRoundedRect(face.adjusted(-spread, -spread, spread, spread).translated(0, offset),
+                                    self.RADIUS + spread, self.RADIUS + spread)
+        
+        clip = QPainterPath()
+        clip.addRoundedRect(face, self.RADIUS, self.RADIUS)
+        painter.setClipPath(clip)
+        title_font, time_font, lang_font, fallback_font = self.fonts
+        if self.cover is not None:
+            painter.drawPixmap(face.topLeft(), self.cover)
+        else:
+            background = QLinearGradient(face.topLeft(), face.bottomLeft())
+            background.setColorAt(0, QColor("#2196F3"))
+            background.setColorAt(1, QColor("#1976D2"))
+            painter.fillRect(face, background)
+            painter.setPen(Qt.white)
+            painter.setFont(fallback_font)
+            painter.drawText(face, Qt.AlignCenter, "ANIME")
+        
+        overlay = QLinearGradient(face.topLeft(), face.bottomLeft())
+        overlay.setColorAt(0, QColor(0, 0, 0, 51))
+        overlay.setColorAt(0.4, QColor(0, 0, 0, 102))
+        overlay.setColorAt(1, QColor(0, 0, 0, 178))
+        painter.fillRect(face, overlay)
+        
+        # Title, then the time and language row under it
+        text_area = face.adjusted(12, 8, -12, -8)
+        painter.setPen(Qt.white)
+        painter.setFont(title_font)
+        flags = Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap
+        title_rect = painter.boundingRect(text_area, flags, self.anime_data.name)
+        painter.drawText(text_area, flags, self.anime_data.name)
+        
+        info = QRectF(text_area.left(), title_rect.bottom() + 4, text_area.width(), 24)
+        painter.setPen(QColor("#FFD700"))
+        painter.setFont(time_font)
+        painter.drawText(info, Qt.AlignLeft | Qt.AlignVCenter, self.anime_data.local_time)
+        painter.setPen(QColor("#87CEEB"))
+        painter.setFont(lang_font)
+        painter.drawText(info, Qt.AlignRight | Qt.AlignVCenter, self.anime_data.language.upper())
+        
+    def set_elevation(self, target, start=None):
+        """Animate towards an elevation level, optionally jumping to `start` first"""
+        if start is not None:
+            self.elevation = start
+        self.elevation_target = target
+        card_animator.animate(self)
         
     def enterEvent(self, event):
         """Handle mouse enter event with Material Design elevation"""
-        try:
-            # Apply higher elevation without changing geometry
-            self.setStyleSheet(self.elevation_8)
-            
-            # Create shadow effect using PyQt5 graphics effects
-            from PyQt5.QtWidgets import QGraphicsDropShadowEffect
-            from PyQt5.QtGui import QColor
-            
-            # Create shadow effect for elevation
-            shadow = QGraphicsDropShadowEffect()
-            shadow.setBlurRadius(15)
-            shadow.setColor(QColor(0, 0, 0, 80))
-            shadow.setOffset(0, 6)
-            self.setGraphicsEffect(shadow)
-            
-        except Exception:
-            pass
+        self.set_elevation(1.0)
         
     def leaveEvent(self, event):
         """Handle mouse leave event with Material Design elevation"""
-        try:
-            # Return to normal elevation
-            self.setStyleSheet(self.elevation_1)
-            self.setGraphicsEffect(None)
-        except Exception:
-            pass
+        self.set_elevation(0.0)
     
     def on_click(self, event):
-        """Handle card click with Material Design ripple effect"""
+        """Handle card click with Material Design press feedback"""
         if event.button() == Qt.LeftButton:
-            try:
-                # Material Design ripple effect with shadow
-                self.setStyleSheet(self.elevation_4)  # Medium elevation on click
-                
-                # Create click shadow effect
-                from PyQt5.QtWidgets import QGraphicsDropShadowEffect
-                from PyQt5.QtGui import QColor
-                
-                click_shadow = QGraphicsDropShadowEffect()
-                click_shadow.setBlurRadius(10)
-                click_shadow.setColor(QColor(0, 0, 0, 100))
-                click_shadow.setOffset(0, 3)
-                self.setGraphicsEffect(click_shadow)
-                
-                # Quick feedback animation
-                QTimer.singleShot(150, lambda: self.setStyleSheet(self.elevation_8))
-                QTimer.singleShot(300, lambda: self.setStyleSheet(self.elevation_1))
-                QTimer.singleShot(300, lambda: self.setGraphicsEffect(None))
-                
-                # Open web after brief delay
-                QTimer.singleShot(100, self.open_anime_web)
-                
-            except Exception:
-                # Fallback if animation fails
-                self.open_anime_web()
+            # Dip to a lower elevation and spring back while the page opens
+            self.set_elevation(1.0, start=self.PRESSED)
+            # Open web after brief delay so the press gets painted first
+            QTimer.singleShot(100, self.open_anime_web)
     
     def open_anime_web(self):
         """Open anime search page"""
-        anime_name = self.anime_data.get('name', '')
+        anime_name = self.anime_data.name
         if anime_name:
-            webbrowser.open_new(f"https://www.iyf.tv/search/{anime_name}")
+            search_browser.open(anime_name)
 
 # Initialize VLC with proper settings for Windows
 def init_vlc():
@@ -293,7 +538,7 @@ def init_vlc():
         ]
         
         # Create VLC instance
-        vlc_instance = vlc.Instance(vlc_args)
+        vlc_instance = lazy_import("vlc").Instance(vlc_args)
         return vlc_instance
     except Exception:
         return None
@@ -332,6 +577,8 @@ class AnimeThread(QThread):
     """Thread for loading anime data from database with prioritized loading"""
     anime_loaded = pyqtSignal(list)
     all_anime_loaded = pyqtSignal(list)
+    search_loaded = pyqtSignal(dict)
+    load_failed = pyqtSignal(str)
     
     def __init__(self, mongodb_uri):
         super().__init__()
@@ -339,85 +586,156 @@ class AnimeThread(QThread):
         
     def run(self):
         try:
-            client = MongoClient(self.mongodb_uri, serverSelectionTimeoutMS=5000)
-            db = client['anime_db']
-            collection = db['anime_collection']
-            
             # Get current day of week for prioritized loading
             current_day = datetime.date.today().weekday()
             
-            anime_list = []
-            today_anime = []
-            # Cache timezone conversions to avoid repeated calculations
-            timezone_cache = {}
-            
-            # Only fetch necessary fields to speed up the query
-            for anime in collection.find({}, {"translations": 1}):
-                for lang in ["chs", "cht"]:
-                    details = anime.get("translations", {}).get(lang)
-                    if details:
-                        # Use cached timezone conversion
-                        timezone_key = f"{details.get('timezone', 'UTC')}_{details.get('day', 0)}"
-                        if timezone_key not in timezone_cache:
-                            local_day, local_time = self.to_local_time(
-                                details.get("time", "00:00"),
-                                details.get("timezone", "UTC"),
-                                details.get("day", 0)
-                            )
-                            timezone_cache[timezone_key] = (local_day, local_time)
-                        else:
-                            local_day, local_time = timezone_cache[timezone_key]
-                        
-                        anime_entry = {
-                            "name": details.get("name", "Unnamed Anime"),
-                            "day": local_day,
-                            "local_time": local_time,
-                            "timezone": details.get("timezone"),
-                            "image_url": details.get("image_url"),
-                            "language": lang
-                        }
-                        
-                        anime_list.append(anime_entry)
-                        
-                        # Prioritize today's anime
-                        if local_day == current_day:
-                            today_anime.append(anime_entry)
-            
-            # Sort today's anime by time and emit immediately
-            today_anime.sort(key=lambda x: x["local_time"])
-            self.anime_loaded.emit(today_anime)
+            # Entries come back sorted, so today's slice is already in time order
+            # Search titles are collected in the same pass over the collection
+            search_documents = {}
+            if SCHEDULE_URL:
+                # The schedule service has already read and localized the collection
+                with tracer.span("service.load", "io"):
+                    anime_list = lazy_import("schedule_service").fetch_schedule(SCHEDULE_URL, search_documents)
+            else:
+                client = lazy_import("pymongo").MongoClient(self.mongodb_uri, serverSelectionTimeoutMS=5000)
+                db = client['anime_db']
+                collection = db['anime_collection']
+                with tracer.span("db.load", "io"):
+                    anime_list = load_schedule(collection, search_documents=search_documents)
+            self.anime_loaded.emit(entries_for_day(anime_list, current_day))
             
-            # Sort all anime and emit in background
-            anime_list.sort(key=lambda x: (x["day"], x["local_time"]))
             self.all_anime_loaded.emit(anime_list)
+            self.search_loaded.emit(search_documents)
             
         except Exception as e:
             print(f"Error loading anime: {e}")
-            # Return empty list if database is not available
-            self.anime_loaded.emit([])
-            self.all_anime_loaded.emit([])
+            # A failed refresh must not wipe the schedule that is already shown
+            self.load_failed.emit(str(e))
+
+class CoverPrefetchThread(QThread):
+    """Warms cover_cache for entries that are about to be shown"""
+    cover_ready = pyqtSignal(str, QImage)
+    
+    def __init__(self, urls, face=AnimeCard.FACE):
+        super().__init__()
+        self.urls = list(urls)
+        self.face = face
+        
+    def run(self):
+        for url in self.urls:
+            if self.isInterruptionRequested():
+                return
+            image = cover_cache.get(url)
+            if image is None:
+                try:
+                    # Scaled and cropped once so painting is a straight blit
+                    image = fetch_cover(url, self.face)
+                except Exception as e:
+                    print(f"Error prefetching cover {url}: {e}")
+                    continue
+                if image is None:
+                    continue
+                cover_cache.put(url, image)
+            self.cover_ready.emit(url, image)
+
+class CoverLoader:
+    """Fetches covers for cards that missed cover_cache, off the GUI thread.
     
-    def to_local_time(self, anime_time, anime_timezone, date_of_week):
-        """Convert the anime's scheduled time and day to local time and day."""
-        anime_hour, anime_minute = map(int, anime_time.split(':'))
-        anime_tz = pytz.timezone(anime_timezone)
+    Requests made while one batch of cards is being built are collected and
+    handed to a single CoverPrefetchThread. Covers are delivered to the cards
+    on the GUI thread as each one arrives.
+    """
+    def __init__(self):
+        # url -> cards waiting for it
+        self.pending = {}
+        self.queued = []
+        self.threads = set()
+        
+    def request(self, url, card):
+        cards = self.pending.setdefault(url, [])
+        cards.append(card)
+        if len(cards) > 1:
+            return
+        if not self.queued:
+            QTimer.singleShot(0, self.flush)
+        self.queued.append(url)
         
-        anime_datetime = datetime.datetime.now(anime_tz).replace(
-            hour=anime_hour, minute=anime_minute, second=0, microsecond=0
-        )
-        anime_datetime += datetime.timedelta(days=abs(date_of_week - anime_datetime.weekday()) % 7)
+    def flush(self):
+        urls, self.queued = self.queued, []
+        if not urls:
+            return
+        thread = CoverPrefetchThread(urls)
+        thread.cover_ready.connect(self.deliver)
+        thread.finished.connect(lambda: self.finished(thread, urls))
+        self.threads.add(thread)
+        thread.start()
+        
+    def deliver(self, url, image):
+        for card in self.pending.pop(url, ()):
+            try:
+                card.set_cover(image)
+            except RuntimeError:
+                # The card was deleted while its cover downloaded
+                pass
         
-        local_time = anime_datetime.astimezone()
-        local_day = (date_of_week + (local_time.date() - anime_datetime.date()).days) % 7
+    def finished(self, thread, urls):
+        # Failed downloads can be asked for again by the next card that shows them
+        for url in urls:
+            self.pending.pop(url, None)
+        # finished fires just before the thread exits, let it exit before dropping it
+        thread.wait()
+        self.threads.discard(thread)
+        
+    def stop(self):
+        for thread in list(self.threads):
+            thread.requestInterruption()
+            thread.wait()
+
+cover_loader = CoverLoader()
+
+class PortraitThread(QThread):
+    """Thread that squares and scales every character portrait once at startup"""
+    portrait_ready = pyqtSignal(str, QImage)
+    
+    def __init__(self, char_path, char_list, size=500):
+        super().__init__()
+        self.char_path = char_path
+        self.char_list = list(char_list)
+        self.size = size
         
-        return local_day, local_time.strftime('%H:%M')
+    def run(self):
+        for name in self.char_list:
+            image = load_portrait_image(os.path.join(self.char_path, name + ".png"), self.size)
+            if image is not None:
+                self.portrait_ready.emit(name, image)
+
+def load_portrait_image(path, size):
+    """Load a character image centered on a transparent square of the given size.
+    
+    Works on QImage so it is safe to call outside the GUI thread.
+    """
+    source = QImage(path)
+    if source.isNull():
+        print(f"Failed to load character image: {path}")
+        return None
+    source = source.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.drawImage((size - source.width()) // 2, (size - source.height()) // 2, source)
+    painter.end()
+    return image
 
 class App(QMainWindow):
+    # Emitted from the audio init thread, delivered on the GUI thread
+    audio_initialized = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         
         self.setWindowTitle("Arc")
         self.setGeometry(100, 100, 800, 450)
+        self.setStyleSheet(app_stylesheet("Light"))
         
         # Character list for kantai
         self.char_list = ['Верный', 'Warspite', 'Kawakaze', 'Yura', 'Ark_Royal']
@@ -427,17 +745,37 @@ class App(QMainWindow):
         self.mongodb_uri = self.load_mongodb_uri()
         self.is_closing = False
         
-        # Initialize audio systems
-        self.init_audio_systems()
+        # Audio systems are initialized on a background thread after first paint
+        self.vlc_instance = None
+        self.pygame_available = False
+        self.winsound_available = False
+        self.audio_ready = Event()
+        self.audio_lock = Lock()
+        self.audio_started = False
+        # Playback requested before audio was ready, run by on_audio_initialized
+        self.pending_audio = []
+        self.audio_initialized.connect(self.on_audio_initialized)
         
         # Check day of week and import anime list
         self.day_of_week = datetime.date.today().weekday()
         self.anime_list = []
         self.anime_next = None
+        # Tomorrow's entries, built and warmed late in the day by prefetch_tomorrow
+        self.tomorrow_anime = None
+        self.prefetched_day = None
+        self.prefetch_thread = None
+        # Title index behind the search box, updated in place on every reload
+        self.search_index = SearchIndex()
         
         # Load images
         self.load_images()
         
+        # Character portraits are prepared off the GUI thread, switching is then a dict lookup
+        self.portraits = {}
+        self.portrait_thread = PortraitThread(self.char_path, self.char_list)
+        self.portrait_thread.portrait_ready.connect(self.on_portrait_ready)
+        self.portrait_thread.start()
+        
         # Create central widget and layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -477,6 +815,9 @@ class App(QMainWindow):
         # Show home page and ensure it's properly displayed
         self.show_home_page()
         
+        # Warm the in-app browser once the window has had time to paint
+        QTimer.singleShot(1500, search_browser.warm_up)
+        
     def load_mongodb_uri(self):
         """Load MongoDB URI from config.json."""
         try:
@@ -548,9 +889,9 @@ class App(QMainWindow):
     def create_navigation_frame(self):
         """Create the navigation sidebar"""
         self.nav_frame = QFrame()
+        self.nav_frame.setObjectName("nav_frame")
         self.nav_frame.setMaximumWidth(200)
         self.nav_frame.setMinimumWidth(200)
-        self.nav_frame.setStyleSheet("QFrame { background-color: #2b2b2b; }")
         
         nav_layout = QVBoxLayout(self.nav_frame)
         
@@ -559,7 +900,7 @@ class App(QMainWindow):
         logo_label.setPixmap(self.logo_pixmap.scaled(26, 26, Qt.KeepAspectRatio))
         title_label = QLabel("  Arc Demo")
         title_label.setFont(QFont("Arial", 15, QFont.Bold))
-        title_label.setStyleSheet("color: white;")
+        title_label.setObjectName("nav_title")
         
         title_layout = QHBoxLayout()
         title_layout.addWidget(logo_label)
@@ -568,34 +909,35 @@ class App(QMainWindow):
         
         # Navigation buttons
         self.home_button = QPushButton("Home")
-        self.home_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: white;
-                text-align: left;
-                padding: 10px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #404040;
-            }
-            QPushButton:pressed {
-                background-color: #505050;
-            }
-        """)
+        self.home_button.setObjectName("nav_button")
         self.home_button.clicked.connect(self.show_home_page)
         nav_layout.addWidget(self.home_button)
         
         self.playlist_button = QPushButton("Playlist")
-        self.playlist_button.setStyleSheet(self.home_button.styleSheet())
+        self.playlist_button.setObjectName("nav_button")
         self.playlist_button.clicked.connect(self.show_playlist_page)
         nav_layout.addWidget(self.playlist_button)
         
         self.add_person_button = QPushButton("Add person")
-        self.add_person_button.setStyleSheet(self.home_button.styleSheet())
+        self.add_person_button.setObjectName("nav_button")
         self.add_person_button.clicked.connect(self.show_add_person_page)
         nav_layout.addWidget(self.add_person_button)
         
+        # Title search over every loaded translation, results update per keystroke
+        self.search_box = QLineEdit()
+        self.search_box.setObjectName("nav_search")
+        self.search_box.setPlaceholderText("Search anime")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.update_search_results)
+        self.search_box.returnPressed.connect(self.open_first_search_result)
+        nav_layout.addWidget(self.search_box)
+        
+        self.search_results = QListWidget()
+        self.search_results.setObjectName("search_results")
+        self.search_results.itemClicked.connect(self.open_search_result)
+        self.search_results.hide()
+        nav_layout.addWidget(self.search_results, 1)
+        
         # Appearance mode selector
         self.appearance_combo = QComboBox()
         self.appearance_combo.addItems(["Light", "Dark", "System"])
@@ -621,15 +963,6 @@ class App(QMainWindow):
         self.clock_label.setFont(QFont("Courier New", 15, QFont.Bold))
         self.clock_label.setAlignment(Qt.AlignCenter)
         self.clock_label.setText("Loading...")
-        self.clock_label.setStyleSheet("""
-            QLabel {
-                color: #333;
-                background-color: #f0f0f0;
-                padding: 10px;
-                border-radius: 5px;
-                margin: 5px;
-            }
-        """)
         home_layout.addWidget(self.clock_label)
         
         # Set initial time
@@ -649,16 +982,6 @@ class App(QMainWindow):
         self.character_label.setObjectName("character_label")
         self.character_label.setPixmap(self.large_test_pixmap.scaled(500, 500, Qt.KeepAspectRatio))
         self.character_label.setAlignment(Qt.AlignCenter)
-        self.character_label.setStyleSheet("""
-            QLabel {
-                border: 2px solid #ddd;
-                border-radius: 20px;
-                padding: 20px;
-                background-color: white;
-                min-width: 540px;
-                min-height: 540px;
-            }
-        """)
         left_section.addWidget(self.character_label)
         
         # Buttons
@@ -668,37 +991,11 @@ class App(QMainWindow):
         self.start_kantai_button = QPushButton("Start Kantai")
         self.start_kantai_button.setObjectName("start_kantai_button")
         self.start_kantai_button.clicked.connect(self.start_kantai)
-        self.start_kantai_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
         button_layout.addWidget(self.start_kantai_button)
         
         self.next_char_button = QPushButton("Next Character")
         self.next_char_button.setObjectName("next_char_button")
         self.next_char_button.clicked.connect(self.change_char)
-        self.next_char_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-        """)
         button_layout.addWidget(self.next_char_button)
         
         left_section.addLayout(button_layout)
@@ -712,41 +1009,13 @@ class App(QMainWindow):
         
         # Section title
         title_label = QLabel("Today's Anime")
+        title_label.setObjectName("section_title")
         title_label.setFont(QFont("Arial", 14, QFont.Bold))
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #333;
-                padding: 5px;
-                background-color: #f8f9fa;
-                border-radius: 5px;
-                border-left: 4px solid #007bff;
-            }
-        """)
         right_section.addWidget(title_label)
         
         # Today's anime list
         self.anime_scroll = QScrollArea()
         self.anime_scroll.setObjectName("anime_scroll")
-        self.anime_scroll.setStyleSheet("""
-            QScrollArea {
-                border: 2px solid #ddd;
-                border-radius: 10px;
-                background-color: white;
-            }
-            QScrollBar:vertical {
-                background-color: #f0f0f0;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #c0c0c0;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #a0a0a0;
-            }
-        """)
         
         self.anime_widget = QWidget()
         self.anime_widget.setObjectName("anime_widget")
@@ -756,17 +1025,8 @@ class App(QMainWindow):
         
         # Add loading indicator
         self.loading_label = QLabel("Loading anime...")
+        self.loading_label.setObjectName("placeholder_label")
         self.loading_label.setAlignment(Qt.AlignCenter)
-        self.loading_label.setStyleSheet("""
-            QLabel {
-                color: gray;
-                font-style: italic;
-                padding: 20px;
-                background-color: #f9f9f9;
-                border-radius: 8px;
-                margin: 10px;
-            }
-        """)
         self.anime_layout.addWidget(self.loading_label)
         
         self.anime_scroll.setWidget(self.anime_widget)
@@ -779,20 +1039,6 @@ class App(QMainWindow):
         self.upcoming_anime_btn = QPushButton("No upcoming anime")
         self.upcoming_anime_btn.setObjectName("upcoming_anime_btn")
         self.upcoming_anime_btn.clicked.connect(lambda: self.open_web(""))
-        self.upcoming_anime_btn.setStyleSheet("""
-            QPushButton {
-                padding: 12px;
-                background-color: #28a745;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-        """)
         right_section.addWidget(self.upcoming_anime_btn)
         
         main_content_layout.addLayout(right_section)
@@ -837,16 +1083,11 @@ class App(QMainWindow):
         
         # Simple placeholder for add person functionality
         placeholder_label = QLabel("Add Person Page")
+        placeholder_label.setObjectName("add_person_label")
         placeholder_label.setAlignment(Qt.AlignCenter)
-        placeholder_label.setStyleSheet("""
-            QLabel {
-                font-size: 24px;
-                color: #333;
-                padding: 50px;
-            }
-        """)
         layout.addWidget(placeholder_label)
         
+    @tracer.traced("page.switch.home", "ui")
     def show_home_page(self):
         """Show the home page"""
         try:
@@ -881,6 +1122,7 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Unexpected error in show_home_page: {e}")
         
+    @tracer.traced("page.switch.playlist", "ui")
     def show_playlist_page(self):
         """Show the playlist page"""
         try:
@@ -902,6 +1144,7 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Unexpected error in show_playlist_page: {e}")
         
+    @tracer.traced("page.switch.add_person", "ui")
     def show_add_person_page(self):
         """Show the add person page"""
         try:
@@ -962,44 +1205,41 @@ class App(QMainWindow):
         }
         
         for page, button in buttons.items():
-            if page == active_page:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #505050;
-                        color: white;
-                        text-align: left;
-                        padding: 10px;
-                        border: none;
-                    }
-                """)
-            else:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: transparent;
-                        color: white;
-                        text-align: left;
-                        padding: 10px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #404040;
-                    }
-                """)
+            active = page == active_page
+            # Only repolish the buttons whose state actually changed
+            if button.property("active") != active:
+                button.setProperty("active", active)
+                button.style().unpolish(button)
+                button.style().polish(button)
         
         # Store current active page for timer management
         self.current_active_page = active_page
     
     def load_anime_data(self):
         """Load anime data from database with prioritized loading"""
-        if self.mongodb_uri:
+        if self.mongodb_uri or SCHEDULE_URL:
             self.anime_thread = AnimeThread(self.mongodb_uri)
             self.anime_thread.anime_loaded.connect(self.on_today_anime_loaded)
             self.anime_thread.all_anime_loaded.connect(self.on_all_anime_loaded)
+            self.anime_thread.search_loaded.connect(self.on_search_loaded)
+            self.anime_thread.load_failed.connect(self.on_anime_load_failed)
+            self.anime_thread.start()
+        if SCHEDULE_URL and not hasattr(self, 'schedule_timer'):
+            self.schedule_timer = QTimer()
+            self.schedule_timer.timeout.connect(self.reload_schedule)
+            self.schedule_timer.start(SCHEDULE_RELOAD_MS)
+    
+    def reload_schedule(self):
+        """Pick up schedule service updates, skipped while a load is still running"""
+        if not self.is_closing and not self.anime_thread.isRunning():
             self.anime_thread.start()
     
     def on_today_anime_loaded(self, today_anime):
         """Handle today's anime data (prioritized loading)"""
         try:
+            # Periodic reloads of an unchanged schedule leave the cards alone
+            if today_anime and today_anime == getattr(self, 'today_anime', None):
+                return
             self.today_anime = today_anime
             print(f"Loaded {len(today_anime)} today's anime entries")
             self.update_anime_display()
@@ -1009,10 +1249,21 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Unexpected error in today's anime loading: {e}")
     
+    def on_anime_load_failed(self, error):
+        """Keep the last good schedule, only the very first load falls back to the empty view"""
+        if not hasattr(self, 'today_anime'):
+            self.today_anime = []
+            self.update_anime_display()
+            self.check_next_anime()
+    
     def on_all_anime_loaded(self, all_anime):
         """Handle all anime data (background loading)"""
         try:
+            if all_anime and all_anime == self.anime_list:
+                return
             self.anime_list = all_anime
+            # A new schedule invalidates anything prefetched from the old one
+            self.prefetched_day = None
             print(f"Loaded {len(all_anime)} total anime entries")
             # Update playlist page if it's currently visible
             if hasattr(self, 'playlist_page') and self.playlist_page.isVisible():
@@ -1022,6 +1273,34 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Unexpected error in all anime loading: {e}")
     
+    def on_search_loaded(self, documents):
+        """Bring the search index in line with the reloaded schedule"""
+        with tracer.span("search.index", "ui", documents=len(documents)):
+            self.search_index.update(documents)
+        self.update_search_results(self.search_box.text())
+    
+    def update_search_results(self, text):
+        """List the best title matches for the search box text"""
+        with tracer.span("search.query", "ui"):
+            results = self.search_index.search(text, SEARCH_RESULT_LIMIT)
+        self.search_results.setUpdatesEnabled(False)
+        self.search_results.clear()
+        for anime in results:
+            item = QListWidgetItem(f"{anime.name}\n{DAY_ABBREVIATIONS[anime.day]} {anime.local_time}")
+            item.setData(Qt.UserRole, anime.name)
+            item.setToolTip(anime.name)
+            self.search_results.addItem(item)
+        self.search_results.setUpdatesEnabled(True)
+        self.search_results.setVisible(bool(results))
+    
+    def open_search_result(self, item):
+        self.open_web(item.data(Qt.UserRole))
+    
+    def open_first_search_result(self):
+        if self.search_results.count():
+            self.open_search_result(self.search_results.item(0))
+    
+    @tracer.traced("cards.today", "ui")
     def update_anime_display(self):
         """Update the anime display on home page"""
         try:
@@ -1055,8 +1334,8 @@ class App(QMainWindow):
                         anime_card = AnimeCard(anime)
                         self.anime_layout.addWidget(anime_card)
                         
-                        # Add staggered fade-in animation
-                        self.add_card_animation(anime_card, i * 100)  # 100ms delay between cards
+                        # Staggered fade-in, driven by the shared animator
+                        card_animator.fade_in(anime_card, i)
                         count += 1
                     except Exception:
                         # Skip this anime card if there's an error
@@ -1066,17 +1345,8 @@ class App(QMainWindow):
             if count == 0:
                 try:
                     no_anime_label = QLabel("No anime scheduled for today")
+                    no_anime_label.setObjectName("placeholder_label")
                     no_anime_label.setAlignment(Qt.AlignCenter)
-                    no_anime_label.setStyleSheet("""
-                        QLabel {
-                            color: gray;
-                            font-style: italic;
-                            padding: 20px;
-                            background-color: #f9f9f9;
-                            border-radius: 8px;
-                            margin: 10px;
-                        }
-                    """)
                     self.anime_layout.addWidget(no_anime_label)
                 except Exception:
                     # Skip if there's an error creating the label
@@ -1086,82 +1356,49 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Unexpected error in anime display: {e}")
     
-    def add_card_animation(self, card, delay=0):
-        """Add fade-in animation to anime card"""
-        try:
-            # Start with 0 opacity
-            card.setGraphicsEffect(None)  # Remove any existing effects
-            
-            # Create opacity animation
-            opacity_animation = QPropertyAnimation(card, b"windowOpacity")
-            opacity_animation.setDuration(300)
-            opacity_animation.setStartValue(0.0)
-            opacity_animation.setEndValue(1.0)
-            opacity_animation.setEasingCurve(QEasingCurve.OutCubic)
-            
-            # Start animation after delay
-            QTimer.singleShot(delay, opacity_animation.start)
-            
-        except Exception:
-            # If animation fails, just show the card normally
-            pass
-    
     def check_next_anime(self):
         """Find the next upcoming anime"""
         try:
-            current_time = datetime.datetime.now().time()
-            
             # Check if upcoming_anime_btn exists and is valid
             if (not hasattr(self, 'upcoming_anime_btn') or 
                 self.upcoming_anime_btn is None or 
                 self.upcoming_anime_btn.isHidden()):
                 return
             
-            # Use today_anime if available, otherwise fall back to anime_list
-            anime_to_check = getattr(self, 'today_anime', []) if hasattr(self, 'today_anime') else self.anime_list
+            # Prefer the full schedule so tomorrow's first anime can be found, fall back to today's
+            anime_to_check = self.anime_list or getattr(self, 'today_anime', [])
+            anime = next_entry(anime_to_check)
             
-            # Check for today's anime
-            anime_today = [anime for anime in anime_to_check if anime['day'] == self.day_of_week]
-            for anime in anime_today:
-                anime_hour, anime_minute = map(int, anime['local_time'].split(':'))
-                anime_time = datetime.time(anime_hour, anime_minute)
-                
-                if anime_time > current_time:
-                    self.anime_next = anime
+            # Only touch the button when the upcoming anime actually changes
+            if anime == self.anime_next:
+                return
+            self.anime_next = anime
+            try:
+                if anime is None:
+                    # Nothing airs today or tomorrow, don't keep pointing at the last one
+                    self.upcoming_anime_btn.setText("No upcoming anime")
                     try:
-                        self.upcoming_anime_btn.setText(self.split_text(anime['name']))
-                        # Disconnect all existing connections to avoid duplicates
-                        try:
-                            self.upcoming_anime_btn.clicked.disconnect()
-                        except TypeError:
-                            pass  # No connections to disconnect
-                        self.upcoming_anime_btn.clicked.connect(lambda: self.open_web(anime['name']))
-                    except RuntimeError:
-                        # Widget was deleted, skip this update
+                        self.upcoming_anime_btn.clicked.disconnect()
+                    except TypeError:
                         pass
+                    self.upcoming_anime_btn.clicked.connect(lambda: self.open_web(""))
                     return
-            
-            # Fallback to next day
-            next_day = (self.day_of_week + 1) % 7
-            anime_next_day = [anime for anime in anime_to_check if anime['day'] == next_day]
-            if anime_next_day:
-                self.anime_next = anime_next_day[0]
+                self.upcoming_anime_btn.setText(self.split_text(anime.name))
+                # Disconnect all existing connections to avoid duplicates
                 try:
-                    self.upcoming_anime_btn.setText(self.split_text(anime_next_day[0]['name']))
-                    # Disconnect all existing connections to avoid duplicates
-                    try:
-                        self.upcoming_anime_btn.clicked.disconnect()
-                    except TypeError:
-                        pass  # No connections to disconnect
-                    self.upcoming_anime_btn.clicked.connect(lambda: self.open_web(anime_next_day[0]['name']))
-                except RuntimeError:
-                    # Widget was deleted, skip this update
-                    pass
+                    self.upcoming_anime_btn.clicked.disconnect()
+                except TypeError:
+                    pass  # No connections to disconnect
+                self.upcoming_anime_btn.clicked.connect(lambda: self.open_web(anime.name))
+            except RuntimeError:
+                # Widget was deleted, skip this update
+                pass
         except RuntimeError as e:
             print(f"Error checking next anime: {e}")
         except Exception as e:
             print(f"Unexpected error in check_next_anime: {e}")
     
+    @tracer.traced("cards.playlist", "ui")
     def load_anime_playlist(self):
         """Load anime playlist for the playlist page"""
         for day in range(7):
@@ -1174,8 +1411,7 @@ class App(QMainWindow):
                     child.deleteLater()
             
             # Add anime for this day
-            day_anime = [anime for anime in self.anime_list if anime['day'] == day]
-            for anime in day_anime:
+            for anime in entries_for_day(self.anime_list, day):
                 anime_card = AnimeCard(anime)
                 layout.addWidget(anime_card)
     
@@ -1187,19 +1423,7 @@ class App(QMainWindow):
         self.char_pos = (self.char_pos + 1) % len(self.char_list)
         
         # Update character image
-        char_image_path = os.path.join(self.char_path, self.get_cur_char() + ".png")
-        try:
-            if os.path.exists(char_image_path):
-                char_pixmap = QPixmap(char_image_path)
-                if not char_pixmap.isNull():
-                    char_pixmap = char_pixmap.scaled(500, 500, Qt.KeepAspectRatio)
-                    self.character_label.setPixmap(char_pixmap)
-                else:
-                    print(f"Failed to load character image: {char_image_path}")
-            else:
-                print(f"Character image not found: {char_image_path}")
-        except Exception as e:
-            print(f"Error loading character image: {e}")
+        self.show_cur_char()
         
         if self.kantai_is_start:
             self.play_sound("_Intro")
@@ -1208,6 +1432,25 @@ class App(QMainWindow):
         """Get name of current character as string"""
         return self.char_list[self.char_pos]
     
+    def on_portrait_ready(self, name, image):
+        """Convert a prepared portrait to a pixmap once, on the GUI thread"""
+        if name not in self.portraits:
+            self.portraits[name] = QPixmap.fromImage(image)
+    
+    def show_cur_char(self):
+        """Show the current character's cached portrait"""
+        name = self.get_cur_char()
+        try:
+            if name not in self.portraits:
+                # Clicked before the portrait thread reached this character
+                image = load_portrait_image(os.path.join(self.char_path, name + ".png"), 500)
+                if image is None:
+                    return
+                self.on_portrait_ready(name, image)
+            self.character_label.setPixmap(self.portraits[name])
+        except Exception as e:
+            print(f"Error loading character image: {e}")
+    
     def start_kantai(self):
         """Start or stop Kantai mode"""
         self.kantai_is_start = not self.kantai_is_start
@@ -1216,48 +1459,10 @@ class App(QMainWindow):
             # Play start sound
             sound_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Sounds")
             sound_file = os.path.join(sound_path, f"TitleCallA{randint(1, 20)}.mp3")
-            try:
-                if os.path.exists(sound_file):
-                    # Try VLC first
-                    if self.vlc_instance is not None:
-                        try:
-                            media = self.vlc_instance.media_new(sound_file)
-                            self.current_sound = self.vlc_instance.media_player_new()
-                            self.current_sound.set_media(media)
-                            self.current_sound.play()
-                            return
-                        except Exception:
-                            pass
-                    
-                    # Try pygame
-                    if hasattr(self, 'pygame_available') and self.pygame_available:
-                        try:
-                            import pygame
-                            pygame.mixer.music.load(sound_file)
-                            pygame.mixer.music.play()
-                            return
-                        except Exception:
-                            pass
-                    
-                    # Fallback to generic audio function
-                    play_audio_file(sound_file)
-            except Exception:
-                pass
+            self.play_when_ready(sound_file)
             
             # Update character image
-            char_image_path = os.path.join(self.char_path, self.get_cur_char() + ".png")
-            try:
-                if os.path.exists(char_image_path):
-                    char_pixmap = QPixmap(char_image_path)
-                    if not char_pixmap.isNull():
-                        char_pixmap = char_pixmap.scaled(500, 500, Qt.KeepAspectRatio)
-                        self.character_label.setPixmap(char_pixmap)
-                    else:
-                        print(f"Failed to load character image: {char_image_path}")
-                else:
-                    print(f"Character image not found: {char_image_path}")
-            except Exception as e:
-                print(f"Error loading character image: {e}")
+            self.show_cur_char()
         else:
             if self.current_sound:
                 self.current_sound.stop()
@@ -1271,37 +1476,57 @@ class App(QMainWindow):
         if self.kantai_is_start:
             sound_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Sounds")
             sound_file = os.path.join(sound_path, self.get_cur_char() + keyword + ".mp3")
-            try:
-                if os.path.exists(sound_file):
-                    # Stop any currently playing sound
-                    if self.current_sound:
-                        self.current_sound.stop()
-                    
-                    # Try VLC first
-                    if self.vlc_instance is not None:
-                        try:
-                            media = self.vlc_instance.media_new(sound_file)
-                            self.current_sound = self.vlc_instance.media_player_new()
-                            self.current_sound.set_media(media)
-                            self.current_sound.play()
-                            return
-                        except Exception:
-                            pass
-                    
-                    # Try pygame
-                    if hasattr(self, 'pygame_available') and self.pygame_available:
-                        try:
-                            import pygame
-                            pygame.mixer.music.load(sound_file)
-                            pygame.mixer.music.play()
-                            return
-                        except Exception:
-                            pass
-                    
-                    # Fallback to generic audio function
-                    play_audio_file(sound_file)
-            except Exception:
-                pass
+            self.play_when_ready(sound_file)
+    
+    def play_when_ready(self, sound_file):
+        """Play now if audio is initialized, otherwise once the init thread signals"""
+        if self.audio_ready.is_set():
+            self.play_file(sound_file)
+            return
+        self.pending_audio.append(sound_file)
+        if not self.audio_started:
+            Thread(target=self.ensure_audio, daemon=True).start()
+    
+    def on_audio_initialized(self):
+        pending, self.pending_audio = self.pending_audio, []
+        # Kantai may have been closed while audio was starting
+        if pending and self.kantai_is_start and not self.is_closing:
+            self.play_file(pending[-1])
+    
+    @tracer.traced("audio.start", "audio")
+    def play_file(self, sound_file):
+        """Play a sound file with the first audio system that works"""
+        try:
+            if os.path.exists(sound_file):
+                # Stop any currently playing sound
+                if self.current_sound:
+                    self.current_sound.stop()
+                
+                # Try VLC first
+                if self.vlc_instance is not None:
+                    try:
+                        media = self.vlc_instance.media_new(sound_file)
+                        self.current_sound = self.vlc_instance.media_player_new()
+                        self.current_sound.set_media(media)
+                        self.current_sound.play()
+                        return
+                    except Exception:
+                        pass
+                
+                # Try pygame
+                if hasattr(self, 'pygame_available') and self.pygame_available:
+                    try:
+                        import pygame
+                        pygame.mixer.music.load(sound_file)
+                        pygame.mixer.music.play()
+                        return
+                    except Exception:
+                        pass
+                
+                # Fallback to generic audio function
+                play_audio_file(sound_file)
+        except Exception:
+            pass
     
     def check_time(self):
         """Update time display and check for hourly sounds"""
@@ -1328,7 +1553,11 @@ class App(QMainWindow):
                     # Any other error, skip this update
                     pass
             
-            self.day_of_week = current_time.weekday()
+            today = current_time.weekday()
+            if today != self.day_of_week:
+                self.roll_over_day(today)
+            elif current_time.hour >= PREFETCH_FROM_HOUR:
+                self.prefetch_tomorrow()
             
             # Only check next anime if we're on the home page
             if hasattr(self, 'current_active_page') and self.current_active_page == "home":
@@ -1342,10 +1571,37 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Unexpected error in check_time: {e}")
     
+    def prefetch_tomorrow(self):
+        """Build tomorrow's card list and warm its covers before midnight"""
+        tomorrow = (self.day_of_week + 1) % 7
+        if self.prefetched_day == tomorrow or not self.anime_list:
+            return
+        if self.prefetch_thread is not None and self.prefetch_thread.isRunning():
+            return
+        self.prefetched_day = tomorrow
+        self.tomorrow_anime = entries_for_day(self.anime_list, tomorrow)
+        # The next upcoming anime first, it is the next one to be shown
+        upcoming = next_entry(self.anime_list)
+        entries = ([upcoming] if upcoming else []) + self.tomorrow_anime
+        urls = dict.fromkeys(anime.cover_url(200) for anime in entries if anime.cover_url(200))
+        self.prefetch_thread = CoverPrefetchThread(urls)
+        # Low priority so prefetching only takes otherwise idle time
+        self.prefetch_thread.start(QThread.LowPriority)
+    
+    def roll_over_day(self, today):
+        """Switch the home page to the new day, using the prefetched list when there is one"""
+        self.day_of_week = today
+        if self.prefetched_day == today and self.tomorrow_anime is not None:
+            self.today_anime = self.tomorrow_anime
+        elif self.anime_list:
+            self.today_anime = entries_for_day(self.anime_list, today)
+        self.tomorrow_anime = None
+        self.update_anime_display()
+    
     def open_web(self, keyword):
         """Open website for anime"""
         if keyword:
-            webbrowser.open_new(f"https://www.iyf.tv/search/{keyword}")
+            search_browser.open(keyword)
     
     def split_text(self, text):
         """Split text for display"""
@@ -1355,15 +1611,9 @@ class App(QMainWindow):
     
     def change_appearance_mode(self, mode):
         """Change appearance mode"""
-        if mode == "Dark":
-            self.setStyleSheet("""
-                QMainWindow, QWidget {
-                    background-color: #2b2b2b;
-                    color: white;
-                }
-            """)
-        elif mode == "Light":
-            self.setStyleSheet("")
+        if mode in ("Dark", "Light"):
+            # A single window-level sheet, Qt repolishes every widget once
+            self.setStyleSheet(app_stylesheet(mode))
         # System mode would require detecting system theme
     
     def closeEvent(self, event):
@@ -1383,7 +1633,21 @@ class App(QMainWindow):
                 except Exception:
                     pass
             
+            search_browser.close()
+            
             # Clean up any threads
+            if hasattr(self, 'portrait_thread') and self.portrait_thread:
+                try:
+                    self.portrait_thread.wait()
+                except Exception:
+                    pass
+            if self.prefetch_thread is not None:
+                try:
+                    self.prefetch_thread.requestInterruption()
+                    self.prefetch_thread.wait()
+                except Exception:
+                    pass
+            cover_loader.stop()
             if hasattr(self, 'anime_thread') and self.anime_thread:
                 try:
                     self.anime_thread.quit()
@@ -1421,6 +1685,36 @@ class App(QMainWindow):
         except Exception as e:
             print(f"Error checking widget initialization: {e}")
     
+    def on_first_paint(self):
+        """Start the deferred subsystems once the window is on screen"""
+        mark_startup("first paint")
+        Thread(target=self.deferred_init, daemon=True).start()
+    
+    def deferred_init(self):
+        """Background stage of startup: audio devices and network modules"""
+        self.ensure_audio()
+        try:
+            lazy_import("requests")
+        except ImportError:
+            pass
+        mark_startup("deferred init done")
+        if STARTUP_REPORT:
+            print_startup_report()
+    
+    def ensure_audio(self):
+        """Initialize audio once, off the GUI thread, waiting if another thread is already on it"""
+        with self.audio_lock:
+            start_here = not self.audio_started
+            self.audio_started = True
+        if start_here:
+            try:
+                self.init_audio_systems()
+            finally:
+                self.audio_ready.set()
+                self.audio_initialized.emit()
+        else:
+            self.audio_ready.wait(10)
+    
     def init_audio_systems(self):
         """Initialize all available audio systems"""
         # Initialize VLC
@@ -1448,7 +1742,18 @@ class App(QMainWindow):
 
 
 if __name__ == "__main__":
+    tracer.start()
+    # Lets QtWebEngine be imported lazily after the application exists
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    # Opt-in: log the GUI thread's stack whenever the event loop freezes
+    stall_threshold = threshold_from_environment()
+    if stall_threshold is not None:
+        watchdog = StallWatchdog(stall_threshold)
+        watchdog.start()
     window = App()
+    mark_startup("App constructed")
     window.show()
+    # Runs once the first show/paint events have been processed
+    QTimer.singleShot(0, window.on_first_paint)
     sys.exit(app.exec_()) 
\ No newline at end of file
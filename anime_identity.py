@@ -0,0 +1,129 @@
+"""Title identity index for scraped anime.
+
+Maps the many names one show is scraped under (CHS, CHT, MyAnimeList English,
+small spelling changes between seasons) to a single anime_id. Every name ever
+seen for an id is kept as an alias in anime_info_collection. Lookups try the
+normalized alias table first, then a character n-gram inverted index. A fuzzy
+title match is only accepted when the airtime or the cover art agrees too, so
+franchise siblings with similar titles keep their own ids.
+"""
+from anime_merge import WINDOW_MINUTES, normalize_title, title_ngrams, minute_distance
+
+# Trigram similarity needed to reuse an id for a title that is not a known alias
+MATCH_THRESHOLD = 0.6
+# Cover dHashes at most this many bits apart count as the same picture
+COVER_RADIUS = 6
+# Trigrams keep posting lists short for Latin titles across many seasons
+NGRAM = 3
+# N-grams shared by more aliases than this are skipped as too common to discriminate
+STOP_GRAM_POSTINGS = 512
+
+
+class TitleIndex:
+    """In-memory index of anime_info_collection, keyed by normalized aliases"""
+
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        # normalized alias -> anime_id
+        self.exact = {}
+        # alias number -> anime_id / n-gram set, n-gram -> alias numbers
+        self.alias_ids = []
+        self.alias_grams = []
+        self.postings = {}
+        self.minutes = {}
+        self.covers = {}
+        # anime_id -> 64-bit cover dHashes
+        self.cover_hashes = {}
+
+    @classmethod
+    def from_collection(cls, anime_info_collection, threshold=MATCH_THRESHOLD):
+        """Build the index from every season stored in anime_info_collection."""
+        index = cls(threshold)
+        projection = {"anime_id": 1, "name": 1, "aliases": 1, "minute": 1, "image_urls": 1, "cover_hashes": 1}
+        for info in anime_info_collection.find({}, projection):
+            names = [info["name"]] if info.get("name") else []
+            index.add(info["anime_id"], names + info.get("aliases", []),
+                      info.get("minute"), info.get("image_urls", []),
+                      [int(value, 16) for value in info.get("cover_hashes", [])])
+        return index
+
+    def add(self, anime_id, names, minute=None, image_urls=(), cover_hashes=()):
+        """Record names, airtime, cover URLs and cover dHashes for an id."""
+        for name in names:
+            normalized = normalize_title(name)
+            if not normalized or normalized in self.exact:
+                continue
+            self.exact[normalized] = anime_id
+            grams = title_ngrams(normalized, NGRAM)
+            alias = len(self.alias_ids)
+            self.alias_ids.append(anime_id)
+            self.alias_grams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(alias)
+        if minute is not None:
+            self.minutes[anime_id] = minute
+        for url in image_urls:
+            if url:
+                self.covers[url] = anime_id
+        if cover_hashes:
+            self.cover_hashes.setdefault(anime_id, set()).update(cover_hashes)
+
+    def similar(self, name):
+        """{anime_id: best similarity} for ids with an alias close to name."""
+        grams = title_ngrams(normalize_title(name), NGRAM)
+        if not grams:
+            return {}
+        postings = [self.postings[gram] for gram in grams if gram in self.postings]
+        selective = [aliases for aliases in postings if len(aliases) <= STOP_GRAM_POSTINGS]
+        if postings and not selective:
+            # Every gram is common, fall back to the rarest few
+            selective = sorted(postings, key=len)[:3]
+        overlaps = {}
+        for aliases in selective:
+            for alias in aliases:
+                overlaps[alias] = overlaps.get(alias, 0) + 1
+        scores = {}
+        for alias, overlap in overlaps.items():
+            score = 2 * overlap / (len(grams) + len(self.alias_grams[alias]))
+            anime_id = self.alias_ids[alias]
+            if score > scores.get(anime_id, 0.0):
+                scores[anime_id] = score
+        return scores
+
+    def same_cover(self, anime_id, image_urls, cover_hashes):
+        """Whether any of the covers is a known cover of anime_id."""
+        if any(self.covers.get(url) == anime_id for url in image_urls):
+            return True
+        known = self.cover_hashes.get(anime_id, ())
+        return any(bin(value ^ other).count("1") <= COVER_RADIUS
+                   for value in cover_hashes for other in known)
+
+    def resolve(self, names, minute=None, image_urls=(), cover_hashes=(), exclude=()):
+        """anime_id for a show scraped under `names`, None if it is new.
+
+        Ids in `exclude` (already given to another show) are never returned.
+        """
+        for name in names:
+            anime_id = self.exact.get(normalize_title(name))
+            if anime_id is not None and anime_id not in exclude:
+                return anime_id
+
+        scores = {}
+        for name in names:
+            for anime_id, score in self.similar(name).items():
+                if score >= self.threshold and score > scores.get(anime_id, 0.0) and anime_id not in exclude:
+                    scores[anime_id] = score
+
+        # A similar title alone is not enough, sequels and spin-offs share most of theirs
+        candidates = {}
+        for anime_id, score in scores.items():
+            known_minute = self.minutes.get(anime_id)
+            distance = minute_distance(known_minute, minute) if None not in (known_minute, minute) else None
+            same_cover = self.same_cover(anime_id, image_urls, cover_hashes)
+            if same_cover or (distance is not None and distance <= WINDOW_MINUTES):
+                # Similarity first, then a shared cover, then the closest airtime
+                candidates[anime_id] = (round(score, 2), same_cover,
+                                        -distance if distance is not None else float("-inf"))
+        if not candidates:
+            return None
+        return max(candidates, key=candidates.get)
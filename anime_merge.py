@@ -0,0 +1,145 @@
+"""Cross-language merge of the scraped schedules.
+
+Each scraper yields {"name", "day", "time", "timezone", "img"} records already
+in local time. Airtimes are converted to minute-of-week integers once, and
+every merged show is filed in a hash index keyed by its hour of the week, so a
+record is only compared with the shows airing in the neighbouring hours.
+"""
+import unicodedata
+
+from anime_schedule import MINUTES_PER_DAY, MINUTES_PER_WEEK, parse_hhmm
+
+HOURS_PER_WEEK = MINUTES_PER_WEEK // 60
+# Translations airing at most this far apart can be the same show
+WINDOW_MINUTES = 60
+# Title similarity needed to merge on the name alone
+TITLE_THRESHOLD = 0.5
+
+
+def normalize_title(name):
+    """Case, width and punctuation insensitive form of a title."""
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return "".join(char for char in name if char.isalnum())
+
+
+def title_ngrams(normalized, n=2):
+    """Character n-grams of a normalized title, short titles are one gram."""
+    if len(normalized) <= n:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + n] for i in range(len(normalized) - n + 1)}
+
+
+def title_similarity(grams, other):
+    """Dice coefficient of two n-gram sets."""
+    if not grams or not other:
+        return 0.0
+    return 2 * len(grams & other) / (len(grams) + len(other))
+
+
+def airing_minute(anime):
+    """Minute of the week a scraped record airs at."""
+    return (anime["day"] * MINUTES_PER_DAY + parse_hhmm(anime["time"])) % MINUTES_PER_WEEK
+
+
+def minute_distance(first, second):
+    """Minutes between two minute-of-week values, wrapping around Sunday night."""
+    distance = abs(first - second) % MINUTES_PER_WEEK
+    return min(distance, MINUTES_PER_WEEK - distance)
+
+
+class MergedAnime:
+    """One show with its scraped records keyed by language"""
+    __slots__ = ("minute", "translations", "grams")
+
+    def __init__(self, minute):
+        self.minute = minute
+        self.translations = {}
+        self.grams = []
+
+    def add(self, lang, anime, grams):
+        self.translations[lang] = anime
+        self.grams.append(grams)
+
+    def absorb(self, other):
+        """Take over the records of another show with no languages in common."""
+        self.translations.update(other.translations)
+        self.grams.extend(other.grams)
+
+    def similarity(self, grams):
+        return max((title_similarity(grams, other) for other in self.grams), default=0.0)
+
+
+class ScheduleMerger:
+    """Collapses the same show scraped in several languages into one MergedAnime"""
+
+    def __init__(self, window=WINDOW_MINUTES, threshold=TITLE_THRESHOLD):
+        self.window = window
+        self.threshold = threshold
+        self.shows = []
+        # hour of the week -> shows starting in that hour
+        self.buckets = {}
+
+    def candidates(self, minute, lang):
+        """Shows within the airing window that have no `lang` record yet."""
+        hour = minute // 60
+        span = -(-self.window // 60)
+        for offset in range(-span, span + 1):
+            for show in self.buckets.get((hour + offset) % HOURS_PER_WEEK, ()):
+                if lang not in show.translations and minute_distance(show.minute, minute) <= self.window:
+                    yield show
+
+    def add_language(self, lang, records):
+        """File every scraped record of one language, returns the show each was merged into.
+
+        All record/show pairs are scored first and matched best-first, so a
+        record is never taken by a weaker match just because it came earlier.
+        """
+        minutes = [airing_minute(anime) for anime in records]
+        grams = [title_ngrams(normalize_title(anime["name"])) for anime in records]
+        candidates = [list(self.candidates(minute, lang)) for minute in minutes]
+        pairs = []
+        for i, shows in enumerate(candidates):
+            for show in shows:
+                score = show.similarity(grams[i])
+                if score >= self.threshold:
+                    pairs.append((score, i, show))
+        pairs.sort(key=lambda pair: pair[0], reverse=True)
+        matched = [None] * len(records)
+        taken = set()
+        for _, i, show in pairs:
+            if matched[i] is None and id(show) not in taken:
+                matched[i] = show
+                taken.add(id(show))
+
+        # Titles in different scripts share no n-grams, an airtime that is
+        # unambiguous on both sides decides for what is still unmatched
+        unmatched_at = {}
+        for i, minute in enumerate(minutes):
+            if matched[i] is None:
+                unmatched_at.setdefault(minute, []).append(i)
+        for minute, indices in unmatched_at.items():
+            if len(indices) != 1:
+                continue
+            i = indices[0]
+            same_minute = [show for show in candidates[i] if show.minute == minute]
+            if len(same_minute) == 1 and id(same_minute[0]) not in taken:
+                matched[i] = same_minute[0]
+                taken.add(id(same_minute[0]))
+
+        for i, anime in enumerate(records):
+            show = matched[i]
+            if show is None:
+                show = MergedAnime(minutes[i])
+                self.shows.append(show)
+                self.buckets.setdefault(minutes[i] // 60, []).append(show)
+                matched[i] = show
+            show.add(lang, anime, grams[i])
+        return matched
+
+
+def merge_schedules(languages):
+    """Merge {lang: [scraped records]} into a list of MergedAnime."""
+    merger = ScheduleMerger()
+    for lang, anime_data in languages.items():
+        merger.add_language(lang, anime_data)
+    return merger.shows
@@ -0,0 +1,166 @@
+"""Compact schedule records shared by the desktop clients"""
+import os
+import sys
+import datetime
+from bisect import bisect_left
+from typing import NamedTuple
+
+from perf_trace import tracer
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Languages shown in the schedule views
+DISPLAY_LANGUAGES = ("chs", "cht")
+# Languages whose titles can be searched
+SEARCH_LANGUAGES = ("chs", "cht", "eng")
+
+# Base URL of the scraper's thumbnail server, e.g. http://host:8765/thumbnails.
+# When unset, covers are downloaded from their original sites.
+THUMBNAIL_BASE = os.environ.get("ARC_THUMBNAIL_URL", "").rstrip("/")
+
+# Timezone name -> minutes to add to convert its wall clock to local time
+_shift_cache = {}
+
+
+class AnimeEntry(NamedTuple):
+    """One airing of an anime translation, already converted to local time.
+
+    minute_of_week comes first so plain tuple ordering sorts by airing time.
+    """
+    minute_of_week: int  # 0 = Monday 00:00 local time
+    name: str
+    timezone: str
+    image_url: str
+    language: str
+    thumbnail: str = ""  # content hash of the scraper's pre-scaled covers
+
+    @property
+    def day(self):
+        """Local day of the week (0 = Monday, 6 = Sunday)"""
+        return self.minute_of_week // MINUTES_PER_DAY
+
+    @property
+    def minute_of_day(self):
+        return self.minute_of_week % MINUTES_PER_DAY
+
+    @property
+    def local_time(self):
+        """Local airing time formatted as HH:MM"""
+        return "%02d:%02d" % divmod(self.minute_of_day, 60)
+
+    def cover_url(self, size):
+        """Pre-scaled thumbnail URL when a thumbnail server is configured, else the original."""
+        if self.thumbnail and THUMBNAIL_BASE:
+            return f"{THUMBNAIL_BASE}/{self.thumbnail}/{size}"
+        return self.image_url
+
+
+def parse_hhmm(text):
+    """Convert an "HH:MM" string to minutes after midnight."""
+    hour, minute = map(int, text.split(':'))
+    return hour * 60 + minute
+
+
+def minute_of_week(moment=None):
+    """Minute of the week for a datetime (defaults to now)."""
+    moment = moment or datetime.datetime.now()
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def local_shift_minutes(timezone):
+    """Minutes to add to a wall-clock time in `timezone` to get local time."""
+    shift = _shift_cache.get(timezone)
+    if shift is None:
+        with tracer.span("schedule.timezone", "schedule", timezone=timezone):
+            # Imported here so loading this module stays cheap at GUI startup
+            import pytz
+            now = datetime.datetime.now(pytz.timezone(timezone))
+            local_offset = now.astimezone().utcoffset()
+            shift = int((local_offset - now.utcoffset()).total_seconds()) // 60
+        _shift_cache[timezone] = shift
+    return shift
+
+
+def reset_timezone_shifts():
+    """Forget cached timezone shifts so the next lookups follow daylight saving changes."""
+    _shift_cache.clear()
+
+
+def entry_from_translation(details, language):
+    """Build an AnimeEntry from a translation sub-document of anime_collection."""
+    timezone = sys.intern(details.get("timezone") or "UTC")
+    scheduled = details.get("day", 0) * MINUTES_PER_DAY + parse_hhmm(details.get("time", "00:00"))
+    return AnimeEntry(
+        (scheduled + local_shift_minutes(timezone)) % MINUTES_PER_WEEK,
+        details.get("name", "Unnamed Anime"),
+        timezone,
+        details.get("image_url") or "",
+        sys.intern(language),
+        details.get("thumbnail") or "",
+    )
+
+
+def try_entry_from_translation(details, language):
+    """entry_from_translation, or None for a translation with a malformed day or time."""
+    try:
+        return entry_from_translation(details, language)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        print(f"Skipping malformed {language} translation {details.get('name')!r}: {e}")
+        return None
+
+
+def load_schedule(collection, languages=DISPLAY_LANGUAGES, search_documents=None):
+    """Read anime_collection and return its entries sorted by local airing time.
+
+    When a search_documents dict is given it is filled in the same pass with
+    {anime key: (titles in SEARCH_LANGUAGES, entry)} for anime_search.
+    """
+    anime_list = []
+    for anime in collection.find({}, {"anime_id": 1, "translations": 1}):
+        translations = anime.get("translations", {})
+        entries = []
+        for lang in languages:
+            details = translations.get(lang)
+            if details:
+                entry = try_entry_from_translation(details, lang)
+                if entry is not None:
+                    entries.append(entry)
+        anime_list.extend(entries)
+        if search_documents is not None:
+            titles = [translations[lang]["name"] for lang in SEARCH_LANGUAGES
+                      if translations.get(lang, {}).get("name")]
+            if not titles:
+                continue
+            # Untranslated shows are still found, listed with their English airing
+            if not entries:
+                entries = [entry for entry in (try_entry_from_translation(translations[lang], lang)
+                                               for lang in SEARCH_LANGUAGES if translations.get(lang))
+                           if entry is not None]
+                if not entries:
+                    continue
+            entry = entries[0]
+            key = anime.get("anime_id") or anime.get("_id") or titles[0]
+            search_documents[str(key)] = (titles, entry)
+    anime_list.sort()
+    return anime_list
+
+
+def entries_for_day(anime_list, day):
+    """Slice of a sorted schedule airing on the given local day."""
+    start = bisect_left(anime_list, (day * MINUTES_PER_DAY,))
+    end = bisect_left(anime_list, ((day + 1) * MINUTES_PER_DAY,))
+    return anime_list[start:end]
+
+
+def next_entry(anime_list, now_minute=None):
+    """Next anime airing later today, falling back to the first one tomorrow."""
+    if not anime_list:
+        return None
+    now_minute = minute_of_week() if now_minute is None else now_minute
+    today = now_minute // MINUTES_PER_DAY
+    index = bisect_left(anime_list, (now_minute + 1,))
+    if index < len(anime_list) and anime_list[index].day == today:
+        return anime_list[index]
+    tomorrow = entries_for_day(anime_list, (today + 1) % 7)
+    return tomorrow[0] if tomorrow else None
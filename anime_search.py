@@ -0,0 +1,92 @@
+"""Instant title search over the loaded schedule.
+
+Every anime is one document holding its CHS, CHT and English titles. Titles
+are normalized (case, width and punctuation folded) and split into character
+trigrams, which work the same for CJK and Latin scripts. The inverted index is
+updated in place when the schedule is reloaded, so only changed anime are
+re-indexed.
+"""
+import heapq
+
+from anime_merge import normalize_title, title_ngrams
+
+NGRAM = 3
+# Share of the query's trigrams a title needs to be listed at all
+MIN_SCORE = 0.5
+
+
+def normalized_titles(titles):
+    """Distinct non-empty normalized forms of a document's titles."""
+    return tuple(dict.fromkeys(filter(None, map(normalize_title, titles))))
+
+
+class SearchIndex:
+    """Trigram inverted index from titles to schedule entries"""
+
+    def __init__(self):
+        # key -> (titles, normalized titles, entry)
+        self.documents = {}
+        # trigram -> keys of documents containing it
+        self.postings = {}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, key, titles, entry):
+        normalized = normalized_titles(titles)
+        self.documents[key] = (tuple(titles), normalized, entry)
+        for title in normalized:
+            for gram in title_ngrams(title, NGRAM):
+                self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        _, normalized, _ = self.documents.pop(key)
+        for title in normalized:
+            for gram in title_ngrams(title, NGRAM):
+                keys = self.postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[gram]
+
+    def update(self, documents):
+        """Sync with {key: (titles, entry)}, touching only anime that changed."""
+        for key in [key for key in self.documents if key not in documents]:
+            self.remove(key)
+        for key, (titles, entry) in documents.items():
+            current = self.documents.get(key)
+            if current is not None:
+                if current[0] == tuple(titles) and current[2] == entry:
+                    continue
+                self.remove(key)
+            self.add(key, titles, entry)
+
+    def search(self, query, limit=20):
+        """Best matching entries for a query, most relevant first."""
+        query = normalize_title(query)
+        if not query:
+            return []
+        if len(query) < NGRAM:
+            # Too short for a trigram, a substring scan is still quick at this size
+            candidates = {key: 1.0 for key, (_, titles, _) in self.documents.items()
+                          if any(query in title for title in titles)}
+        else:
+            grams = title_ngrams(query, NGRAM)
+            hits = {}
+            for gram in grams:
+                for key in self.postings.get(gram, ()):
+                    hits[key] = hits.get(key, 0) + 1
+            candidates = {key: count / len(grams) for key, count in hits.items()
+                          if count / len(grams) >= MIN_SCORE}
+
+        def rank(key):
+            _, titles, entry = self.documents[key]
+            # Whole-query matches beat partial ones, prefixes beat the rest, then shorter titles
+            score = candidates[key]
+            if any(query in title for title in titles):
+                score += 1
+            if any(title.startswith(query) for title in titles):
+                score += 0.5
+            return (-score, min(map(len, titles)), entry)
+
+        return [self.documents[key][2] for key in heapq.nsmallest(limit, candidates, key=rank)]
@@ -0,0 +1,191 @@
+"""Headless benchmark for Main_pyqt.App.
+
+Runs the PyQt app on the offscreen platform against a synthetic schedule
+served by a stub data source, with cover art from a local stand-in image
+server, and writes the timings as JSON for regression tracking:
+
+    python bench_pyqt.py --sizes 100 1000 10000 --output bench_results.json
+
+Each schedule size runs in its own process so peak RSS is per size.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Must be set before Qt is imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+DEFAULT_SIZES = [100, 1000, 10000]
+COVER_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "test_images", "anime.PNG")
+
+
+class StubCollection:
+    """Stands in for anime_collection with a synthetic schedule"""
+
+    def __init__(self, size, image_base=None):
+        self.documents = []
+        for i in range(size):
+            minute = (i * 37) % (24 * 60)
+            self.documents.append({"translations": {
+                "chs" if i % 2 else "cht": {
+                    "name": f"Synthetic Anime {i}",
+                    "day": i % 7,
+                    "time": "%02d:%02d" % divmod(minute, 60),
+                    "timezone": "Asia/Shanghai",
+                    "image_url": f"{image_base}/cover/{i}.png" if image_base else "",
+                }
+            }})
+
+    def find(self, *_):
+        return iter(self.documents)
+
+
+def start_image_server():
+    """Serve the same cover for every path from a local thread, returns (server, base_url)."""
+    with open(COVER_PATH, "rb") as file:
+        cover = file.read()
+
+    class CoverHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(cover)))
+            self.end_headers()
+            self.wfile.write(cover)
+
+        def log_message(self, *_):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CoverHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_size(size, images=True, switches=5):
+    """Benchmark one schedule size in this process and return the results."""
+    from PyQt5.QtWidgets import QApplication
+    import Main_pyqt
+    from anime_schedule import load_schedule, entries_for_day
+
+    class BenchApp(Main_pyqt.App):
+        # No database, the benchmark feeds the schedule itself
+        def load_mongodb_uri(self):
+            return None
+
+    server, base_url = start_image_server() if images else (None, None)
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    result = {"size": size, "images": images}
+
+    start = time.perf_counter()
+    window = BenchApp()
+    window.show()
+    app.processEvents()
+    result["startup_first_paint_ms"] = (time.perf_counter() - start) * 1000
+
+    collection = StubCollection(size, base_url)
+    start = time.perf_counter()
+    anime_list = load_schedule(collection)
+    result["schedule_load_ms"] = (time.perf_counter() - start) * 1000
+
+    window.today_anime = entries_for_day(anime_list, window.day_of_week)
+    window.anime_list = anime_list
+    result["today_entries"] = len(window.today_anime)
+    result["update_anime_display_ms"] = timed(window.update_anime_display)
+    app.processEvents()
+
+    window.show_playlist_page()
+    app.processEvents()
+    result["load_anime_playlist_ms"] = timed(window.load_anime_playlist)
+    app.processEvents()
+
+    round_trips = []
+    for _ in range(switches):
+        start = time.perf_counter()
+        window.show_home_page()
+        app.processEvents()
+        window.show_playlist_page()
+        app.processEvents()
+        round_trips.append((time.perf_counter() - start) * 1000)
+    result["page_switch_roundtrip_ms"] = {
+        "mean": sum(round_trips) / len(round_trips),
+        "max": max(round_trips),
+    }
+
+    result["peak_rss_kb"] = peak_rss_kb()
+    window.close()
+    if server:
+        server.shutdown()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="schedule sizes to benchmark")
+    parser.add_argument("--switches", type=int, default=5, help="page switch round-trips per size")
+    parser.add_argument("--no-images", action="store_true", help="skip cover downloads")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        # Child process: run one size and hand the result back on stdout
+        result = run_size(args.child, not args.no_images, args.switches)
+        print(json.dumps(result))
+        return 0
+
+    results = []
+    for size in args.sizes:
+        command = [sys.executable, os.path.realpath(__file__), "--child", str(size),
+                   "--switches", str(args.switches)]
+        if args.no_images:
+            command.append("--no-images")
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"Size {size} failed:\n{completed.stderr}", file=sys.stderr)
+            results.append({"size": size, "error": completed.stderr.strip().splitlines()[-1:]})
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{size:>6} entries: first paint {result['startup_first_paint_ms']:.0f} ms, "
+              f"today {result['update_anime_display_ms']:.0f} ms, "
+              f"playlist {result['load_anime_playlist_ms']:.0f} ms, "
+              f"switch {result['page_switch_roundtrip_ms']['mean']:.0f} ms, "
+              f"peak RSS {result['peak_rss_kb']} KB")
+        results.append(result)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
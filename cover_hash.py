@@ -0,0 +1,152 @@
+"""Perceptual hashes of cover art for linking translations across sources.
+
+The three scraped sites usually use the same key visual for a show, re-encoded
+and resized. A 64-bit difference hash (dHash) of each cover survives that, so
+covers a few bits apart are the same picture. Covers are shrunk concurrently,
+hashed in one NumPy batch when NumPy is installed, and matched with a BK-tree
+over Hamming distance.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from anime_merge import WINDOW_MINUTES, minute_distance
+
+HASH_WIDTH, HASH_HEIGHT = 9, 8
+DECODE_WORKERS = 8
+# Covers at most this many bits apart are treated as the same picture
+HASH_RADIUS = 6
+
+
+def hamming(first, second):
+    return bin(first ^ second).count("1")
+
+
+def cover_pixels(data):
+    """Shrink encoded image bytes to the 9x8 grayscale grid dHash compares."""
+    with Image.open(BytesIO(data)) as image:
+        image.draft("L", (HASH_WIDTH * 4, HASH_HEIGHT * 4))
+        return image.convert("L").resize((HASH_WIDTH, HASH_HEIGHT), Image.LANCZOS).tobytes()
+
+
+def try_cover_pixels(data):
+    try:
+        return cover_pixels(data)
+    except Exception as e:
+        print(e, "cover decode error")
+        return None
+
+
+def dhash_batch(grids):
+    """64-bit dHash for each 9x8 grayscale grid, in order."""
+    if not grids:
+        return []
+    if np is not None:
+        pixels = np.frombuffer(b"".join(grids), dtype=np.uint8).reshape(-1, HASH_HEIGHT, HASH_WIDTH)
+        bits = pixels[:, :, 1:] > pixels[:, :, :-1]
+        packed = np.packbits(bits.reshape(len(grids), -1), axis=1)
+        return [int.from_bytes(row.tobytes(), "big") for row in packed]
+    hashes = []
+    for grid in grids:
+        value = 0
+        for row in range(HASH_HEIGHT):
+            offset = row * HASH_WIDTH
+            for column in range(HASH_WIDTH - 1):
+                value = (value << 1) | (grid[offset + column + 1] > grid[offset + column])
+        hashes.append(value)
+    return hashes
+
+
+def hash_images(images, workers=DECODE_WORKERS):
+    """{key: dHash} for {key: encoded image bytes}, skipping images that don't decode."""
+    keys = list(images)
+    grids = {}
+    with ThreadPoolExecutor(workers, "cover-hash") as pool:
+        for key, grid in zip(keys, pool.map(try_cover_pixels, (images[key] for key in keys))):
+            if grid is not None:
+                grids[key] = grid
+    return dict(zip(grids, dhash_batch(list(grids.values()))))
+
+
+def format_hash(value):
+    """Fixed-width hex form stored on translations, avoids MongoDB's signed int64."""
+    return "%016x" % value
+
+
+class BKTree:
+    """Nearest-neighbour index over 64-bit hashes with Hamming distance"""
+
+    def __init__(self):
+        # Nodes are [hash, items, {distance: child}]
+        self.root = None
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value, radius):
+        """(distance, item) pairs within radius, closest first."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            # Triangle inequality: only subtrees in [distance - radius, distance + radius] can match
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+
+def link_by_cover(shows, cover_hashes, radius=HASH_RADIUS, window=WINDOW_MINUTES):
+    """Fold merged shows together whose covers match and whose languages don't overlap.
+
+    Runs after anime_merge.merge_schedules to catch translations whose titles
+    and airtimes were not enough on their own. Returns the remaining shows.
+    """
+    tree = BKTree()
+    linked = []
+    for show in shows:
+        target = None
+        for anime in show.translations.values():
+            value = cover_hashes.get(anime["img"])
+            if value is None:
+                continue
+            for _, other in tree.search(value, radius):
+                if (other.translations.keys().isdisjoint(show.translations)
+                        and minute_distance(other.minute, show.minute) <= window):
+                    target = other
+                    break
+            if target is not None:
+                break
+        if target is None:
+            target = show
+            linked.append(show)
+        else:
+            target.absorb(show)
+        for anime in show.translations.values():
+            value = cover_hashes.get(anime["img"])
+            if value is not None:
+                tree.add(value, target)
+    return linked
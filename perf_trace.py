@@ -0,0 +1,195 @@
+"""Opt-in span tracing for the Arc desktop clients.
+
+Tracing is off unless enabled with either
+
+    ARC_TRACE=arc_trace.json python Main_pyqt.py
+    python Main_pyqt.py --trace[=arc_trace.json]
+
+Spans are written as Chrome trace-event JSON (open in chrome://tracing or
+https://ui.perfetto.dev) when the process exits, and a per-span summary is
+logged every ARC_TRACE_SUMMARY seconds (default 60, 0 turns it off).
+When tracing is off, span() hands back a shared no-op context manager.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import functools
+import logging as _logging
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+logger = _logging.getLogger("perf_trace")
+
+DEFAULT_TRACE_PATH = "arc_trace.json"
+# Oldest events are dropped past this many so long sessions stay bounded
+MAX_EVENTS = 200000
+
+_NO_SPAN = nullcontext()
+
+
+class Tracer:
+    """Collects timed spans from any thread"""
+
+    def __init__(self, path=None, summary_interval=60):
+        self.path = path
+        self.enabled = path is not None
+        self.summary_interval = summary_interval
+        self.events = deque(maxlen=MAX_EVENTS)
+        # name -> [count, total seconds, max seconds]
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.t0 = time.perf_counter()
+        self.thread_names = {}
+        self.summary_timer = None
+
+    @classmethod
+    def from_environment(cls, argv=None):
+        """Build a tracer from ARC_TRACE / --trace, disabled if neither is set."""
+        argv = sys.argv if argv is None else argv
+        path = os.environ.get("ARC_TRACE") or None
+        for arg in argv[1:]:
+            if arg == "--trace":
+                path = path or DEFAULT_TRACE_PATH
+            elif arg.startswith("--trace="):
+                path = arg.split("=", 1)[1] or DEFAULT_TRACE_PATH
+        try:
+            interval = float(os.environ.get("ARC_TRACE_SUMMARY", "60"))
+        except ValueError:
+            interval = 60
+        return cls(path, interval)
+
+    def start(self):
+        """Arm the periodic summary and the export at exit."""
+        if not self.enabled:
+            return
+        if not logger.handlers:
+            handler = _logging.StreamHandler()
+            handler.setFormatter(_logging.Formatter("[%(name)s] %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(_logging.INFO)
+        logger.info("Tracing to %s", self.path)
+        atexit.register(self.close)
+        self.schedule_summary()
+
+    def span(self, name, category="app", **args):
+        """Context manager timing the enclosed block as one span."""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name, category, args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start, category, args)
+
+    def traced(self, name, category="app"):
+        """Decorator form of span()."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*func_args, **func_kwargs):
+                with self.span(name, category):
+                    return func(*func_args, **func_kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, start, duration, category="app", args=None):
+        """Add a finished span, start is a time.perf_counter() value."""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self.t0) * 1e6,
+            "dur": duration * 1e6,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+            self.thread_names.setdefault(thread.ident, thread.name)
+            stat = self.stats.get(name)
+            if stat is None:
+                self.stats[name] = [1, duration, duration]
+            else:
+                stat[0] += 1
+                stat[1] += duration
+                stat[2] = max(stat[2], duration)
+
+    def instant(self, name, category="app", **args):
+        """Mark a point in time, e.g. a startup milestone."""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "p",
+            "ts": (time.perf_counter() - self.t0) * 1e6,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+            self.thread_names.setdefault(thread.ident, thread.name)
+
+    def summary(self):
+        """Text table of span counts and durations, slowest total first."""
+        with self.lock:
+            rows = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        lines = ["%-28s %8s %10s %10s %10s" % ("span", "count", "total ms", "mean ms", "max ms")]
+        for name, (count, total, longest) in rows:
+            lines.append("%-28s %8d %10.1f %10.2f %10.2f"
+                         % (name, count, total * 1000, total * 1000 / count, longest * 1000))
+        return "\n".join(lines)
+
+    def schedule_summary(self):
+        if self.summary_interval <= 0:
+            return
+        self.summary_timer = threading.Timer(self.summary_interval, self.log_summary)
+        self.summary_timer.daemon = True
+        self.summary_timer.start()
+
+    def log_summary(self):
+        logger.info("Trace summary\n%s", self.summary())
+        self.schedule_summary()
+
+    def export(self, path=None):
+        """Write collected events as Chrome trace-event JSON."""
+        path = path or self.path
+        with self.lock:
+            events = list(self.events)
+            names = dict(self.thread_names)
+        for tid, thread_name in names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": self.pid,
+                           "tid": tid, "args": {"name": thread_name}})
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return path
+
+    def close(self):
+        if self.summary_timer is not None:
+            self.summary_timer.cancel()
+        try:
+            self.export()
+            logger.info("Trace written to %s\n%s", self.path, self.summary())
+        except OSError as e:
+            print(f"Error writing trace: {e}")
+
+
+# Process-wide tracer, configured from the environment at import time
+tracer = Tracer.from_environment()
+span = tracer.span
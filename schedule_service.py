@@ -0,0 +1,184 @@
+"""Read-through schedule service shared by the desktop clients.
+
+    python schedule_service.py [--port 8766] [--reload-minutes 5]
+
+Reads anime_collection once per reload, converts it to local time, sorts it
+and keeps the encoded responses in memory, so MongoDB sees one reader however
+many clients are open. Clients that set ARC_SCHEDULE_URL=http://<host>:8766
+load from here instead of connecting to the database:
+
+    GET /week       every entry, sorted, plus the search titles
+    GET /today      entries airing today
+    GET /upcoming   the next entry to air, or null
+
+Entries are AnimeEntry fields as JSON arrays, in the service's local time, so
+clients should run in the same timezone. Every response has an ETag and
+answers If-None-Match with 304.
+"""
+import os
+import json
+import hashlib
+import argparse
+import threading
+import datetime
+import urllib.request
+from urllib.error import HTTPError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from anime_schedule import AnimeEntry, load_schedule, entries_for_day, next_entry, reset_timezone_shifts
+
+SCHEDULE_PORT = 8766
+RELOAD_INTERVAL = 5 * 60
+
+# Base URL of a running service, e.g. http://host:8766. When unset, clients read MongoDB.
+SCHEDULE_URL = os.environ.get("ARC_SCHEDULE_URL", "").rstrip("/")
+
+# URL -> (etag, payload) of the last /week response, reused on 304
+_week_cache = {}
+
+
+def encode(payload):
+    """(body, etag) for a JSON payload."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+
+
+class ScheduleSnapshot:
+    """One load of anime_collection with its responses pre-encoded"""
+
+    def __init__(self, anime_list, search_documents):
+        self.anime_list = anime_list
+        self.week = encode({"entries": anime_list, "search": search_documents})
+        self.days = [encode(entries_for_day(anime_list, day)) for day in range(7)]
+
+    def today(self):
+        return self.days[datetime.date.today().weekday()]
+
+    def upcoming(self):
+        # Depends on the clock, so it is the only response encoded per request
+        return encode(next_entry(self.anime_list))
+
+
+class ScheduleService:
+    def __init__(self, mongodb_uri, reload_interval=RELOAD_INTERVAL):
+        self.mongodb_uri = mongodb_uri
+        self.reload_interval = reload_interval
+        self.snapshot = ScheduleSnapshot([], {})
+        self.stopping = threading.Event()
+
+    def reload(self):
+        """Read the collection and swap in a new snapshot, keeping the old one on failure."""
+        try:
+            # Imported here so clients importing this module don't need pymongo
+            from pymongo import MongoClient
+            client = MongoClient(self.mongodb_uri, serverSelectionTimeoutMS=5000)
+            try:
+                # Picks up daylight saving changes in long-running services
+                reset_timezone_shifts()
+                search_documents = {}
+                anime_list = load_schedule(client['anime_db']['anime_collection'],
+                                           search_documents=search_documents)
+            finally:
+                client.close()
+        except Exception as e:
+            print(f"Error loading anime: {e}")
+            return
+        self.snapshot = ScheduleSnapshot(anime_list, search_documents)
+        print(f"Loaded {len(anime_list)} anime entries")
+
+    def run_reloader(self):
+        while not self.stopping.wait(self.reload_interval):
+            self.reload()
+
+    def stop(self):
+        self.stopping.set()
+
+
+def make_server(service, host='0.0.0.0', port=SCHEDULE_PORT):
+    """HTTP server answering /week, /today and /upcoming from the service's snapshot."""
+    routes = {
+        '/week': lambda snapshot: snapshot.week,
+        '/today': ScheduleSnapshot.today,
+        '/upcoming': ScheduleSnapshot.upcoming,
+    }
+
+    class ScheduleHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            route = routes.get(self.path.split('?')[0].rstrip('/'))
+            if route is None:
+                self.send_error(404)
+                return
+            body, etag = route(service.snapshot)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            # Clients may keep a copy but must revalidate, the schedule changes on reload
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    return ThreadingHTTPServer((host, port), ScheduleHandler)
+
+
+def fetch_schedule(base_url=SCHEDULE_URL, search_documents=None, timeout=10):
+    """Client side: the sorted week from a running service, like anime_schedule.load_schedule."""
+    url = base_url + '/week'
+    request = urllib.request.Request(url)
+    cached = _week_cache.get(url)
+    if cached is not None:
+        request.add_header('If-None-Match', cached[0])
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.load(response)
+            _week_cache[url] = (response.headers.get('ETag'), payload)
+    except HTTPError as e:
+        if e.code != 304 or cached is None:
+            raise
+        payload = cached[1]
+    if search_documents is not None:
+        search_documents.update((key, (titles, AnimeEntry(*entry)))
+                                for key, (titles, entry) in payload["search"].items())
+    return [AnimeEntry(*entry) for entry in payload["entries"]]
+
+
+def load_mongodb_uri():
+    try:
+        with open("config.json", "r") as file:
+            return json.load(file).get("mongodb_uri")
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error reading config.json: {e}")
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the localized anime schedule over HTTP")
+    parser.add_argument('--mongodb-uri', help="defaults to mongodb_uri in config.json")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=SCHEDULE_PORT)
+    parser.add_argument('--reload-minutes', type=float, default=RELOAD_INTERVAL / 60,
+                        help="how often anime_collection is re-read")
+    args = parser.parse_args(argv)
+    mongodb_uri = args.mongodb_uri or load_mongodb_uri()
+    if not mongodb_uri:
+        parser.error("no MongoDB URI, pass --mongodb-uri or set mongodb_uri in config.json")
+    service = ScheduleService(mongodb_uri, args.reload_minutes * 60)
+    service.reload()
+    threading.Thread(target=service.run_reloader, name='schedule-reload', daemon=True).start()
+    print(f"Serving schedule on http://{args.host}:{args.port}")
+    try:
+        make_server(service, args.host, args.port).serve_forever()
+    except KeyboardInterrupt:
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
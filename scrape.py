@@ -1,3 +1,4 @@
+import os
 import re
 import pytz
 import datetime
@@ -6,7 +7,16 @@ from bs4 import BeautifulSoup
 from pymongo import MongoClient, UpdateOne
 import json
 import uuid
+import argparse
+import threading
+import functools
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from tqdm import tqdm
+from anime_merge import merge_schedules
+from anime_identity import TitleIndex
+from cover_hash import hash_images, link_by_cover, format_hash
+from thumbnails import THUMBNAIL_SIZES, ThumbnailStore, prefetch_thumbnails
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -30,11 +40,28 @@ weekday = {
     '日': 6
 }
 
-now = datetime.datetime.now().replace(second=0, microsecond=0)
-curr_year = str(now.year)
-curr_month = now.month
+# Detail pages are fetched on this many threads
+FETCH_WORKERS = 8
+# HTML is parsed in worker processes so throughput scales with cores.
+# SCRAPE_PROCESSES=1 or --single-process parses inline for debugging.
+def default_parse_processes():
+    try:
+        return max(1, int(os.environ['SCRAPE_PROCESSES']))
+    except (KeyError, ValueError):
+        return max(1, os.cpu_count() or 1)
+
+PARSE_PROCESSES = default_parse_processes()
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+# Finished detail pages are checkpointed here and reused for a day
+CHECKPOINT_DIR = 'scrape_checkpoints'
+CHECKPOINT_MAX_AGE = 24 * 60 * 60
 
-def get_curr_season(eng=False):
+def get_curr_season(eng=False, moment=None):
+    # Computed per call so a long-running scraper follows the season rollover
+    moment = moment or datetime.datetime.now()
+    curr_year = str(moment.year)
+    curr_month = moment.month
     if curr_month >= 1 and curr_month <= 3:
         curr_season = (curr_year + '/winter') if eng else (curr_year + '01')
     elif curr_month >= 4 and curr_month <= 6:
@@ -59,13 +86,140 @@ def to_local_time(day, time, zone='cst'):
     local_hour_minute = local_time.strftime('%H:%M')
     return day, local_hour_minute
 
-def anime_chs():
+class Checkpoint:
+    """Per-season store of page results that survives an interrupted scrape.
+
+    Results are appended to a JSON lines file as each URL completes and are
+    reused for max_age seconds, so a rerun only fetches what is missing.
+    compact() rewrites the file once a run has finished.
+    """
+    def __init__(self, name, max_age=CHECKPOINT_MAX_AGE, directory=CHECKPOINT_DIR):
+        self.path = os.path.join(directory, name + '.jsonl')
+        self.max_age = max_age
+        self.entries = {}
+        self.lock = threading.Lock()
+        # Set when the file ends in a partial line, the next record starts on a new one
+        self.torn = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    self.torn = not line.endswith('\n')
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Last line cut short by a crash
+                        continue
+                    self.entries[record['url']] = (record['at'], record['result'])
+        except FileNotFoundError:
+            pass
+
+    def get(self, url):
+        entry = self.entries.get(url)
+        if entry is None or datetime.datetime.now().timestamp() - entry[0] > self.max_age:
+            return None
+        return entry[1]
+
+    def __setitem__(self, url, result):
+        at = datetime.datetime.now().timestamp()
+        with self.lock:
+            self.entries[url] = (at, result)
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as file:
+                if self.torn:
+                    file.write('\n')
+                    self.torn = False
+                file.write(json.dumps({'url': url, 'at': at, 'result': result}, ensure_ascii=False) + '\n')
+
+    def compact(self, urls=None):
+        """Rewrite the file with one line per fresh result, limited to urls when given.
+
+        Appends from every run otherwise pile up superseded and expired lines.
+        """
+        now = datetime.datetime.now().timestamp()
+        with self.lock:
+            self.entries = {url: entry for url, entry in self.entries.items()
+                            if now - entry[0] <= self.max_age and (urls is None or url in urls)}
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                for url, (at, result) in self.entries.items():
+                    file.write(json.dumps({'url': url, 'at': at, 'result': result}, ensure_ascii=False) + '\n')
+            os.replace(temporary, self.path)
+            self.torn = False
+
+def fetch_page(url):
+    return requests.get(url=url, headers=headers).content
+
+def set_parse_processes(count):
+    """Change the parse worker count, 1 parses inline in this process."""
+    global PARSE_PROCESSES, _parse_pool
+    with _parse_pool_lock:
+        PARSE_PROCESSES = max(1, count)
+        if _parse_pool is not None:
+            _parse_pool.shutdown()
+            _parse_pool = None
+
+def start_parse_pool():
+    """Create the parse workers, call from the main thread before any fetch threads start.
+
+    Workers are spawned rather than forked, so a pool that is still created
+    lazily from a fetch thread never copies another thread's held locks.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if PARSE_PROCESSES > 1 and _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(PARSE_PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+        return _parse_pool
+
+def submit_parse(parser, page_text):
+    """Run parser(page_text) in a worker process, returns a Future with the records."""
+    if PARSE_PROCESSES > 1:
+        return start_parse_pool().submit(parser, page_text)
+    future = Future()
+    try:
+        future.set_result(parser(page_text))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def fetch_and_parse(urls, parser, desc=None, checkpoint=None):
+    """Fetch urls concurrently and parse each body as soon as it arrives, returns {url: records}.
+
+    With a checkpoint, each result is saved the moment its page is parsed.
+    """
+    def save(url, parse):
+        if parse.exception() is None:
+            checkpoint[url] = parse.result()
+
+    parses = {}
+    with ThreadPoolExecutor(FETCH_WORKERS) as fetchers:
+        fetches = {fetchers.submit(fetch_page, url): url for url in urls}
+        for future in tqdm(as_completed(fetches), total=len(fetches), desc=desc):
+            url = fetches[future]
+            try:
+                parses[url] = submit_parse(parser, future.result())
+            except Exception as e:
+                print(e, "fetching error", url)
+                continue
+            if checkpoint is not None:
+                parses[url].add_done_callback(functools.partial(save, url))
+    results = {}
+    for url, future in parses.items():
+        try:
+            results[url] = future.result()
+        except Exception as e:
+            print(e, "parsing error", url)
+    return results
+
+def parse_chs(page_text):
     anime_list = []
-    url = 'https://yuc.wiki/{}/'.format(get_curr_season(True))
-    page_text = requests.get(url=url, headers=headers).content
+    curr_year = str(datetime.datetime.now().year)
     soup = BeautifulSoup(page_text, 'html.parser')
     animes = soup.find_all('div', {'style': 'float:left'})
-    for anime in tqdm(animes, desc="Processing CHS"):
+    for anime in animes:
         try:
             name = anime.find('td', class_=re.compile('^date_title.*')).text
             date = anime.find('p', {'class': 'imgtext'}).text.split('~')[0] + '/' + curr_year
@@ -82,14 +236,18 @@ def anime_chs():
             print(e, "scraping error")
     return anime_list
 
-def anime_cht():
+def anime_chs():
+    url = 'https://yuc.wiki/{}/'.format(get_curr_season(True))
+    return submit_parse(parse_chs, fetch_page(url)).result()
+
+def parse_cht(page_text):
     anime_list = []
-    url = 'https://acgsecrets.hk/bangumi/{}/'.format(get_curr_season())
-    page_text = requests.get(url=url, headers=headers).content
     soup = BeautifulSoup(page_text, 'html.parser')
     content = soup.find('div', {'id': 'acgs-anime-icons'})
+    if content is None:
+        raise ValueError("CHT anime list not found on the season page")
     animes = content.find_all('div', recursive=False)
-    for anime in tqdm(animes, desc="Processing CHT"):
+    for anime in animes:
         name = anime.find('div', {'class': 'anime_name'}).text
         day = weekday[anime.find('div', {'class': 'day'}).text]
         time = anime.find('div', {'class': 'time'}).text
@@ -98,8 +256,11 @@ def anime_cht():
         anime_list.append({"name": name, "day": day, "time": time, "timezone": "Asia/Taipei", "img": img})
     return anime_list
 
-def get_date_time(url):
-    page_text = requests.get(url=url, headers=headers).content
+def anime_cht():
+    url = 'https://acgsecrets.hk/bangumi/{}/'.format(get_curr_season())
+    return submit_parse(parse_cht, fetch_page(url)).result()
+
+def parse_broadcast(page_text):
     soup = BeautifulSoup(page_text, 'html.parser')
     content_span = soup.find('span', string=re.compile('Broadcast:'))
     if not content_span or not content_span.next_sibling:
@@ -112,21 +273,46 @@ def get_date_time(url):
     zone = content[3][1:-1]
     return to_local_time(day, time, zone)
 
-def anime_eng():
-    anime_list = []
-    url = 'https://myanimelist.net/anime/season/{}'.format(get_curr_season(True))
-    page_text = requests.get(url=url, headers=headers).content
+def get_date_time(url):
+    return parse_broadcast(fetch_page(url))
+
+def parse_eng_season(page_text):
+    entries = []
     soup = BeautifulSoup(page_text, 'html.parser')
     content = soup.find('div', {'class': 'seasonal-anime-list js-seasonal-anime-list js-seasonal-anime-list-key-1'})
+    if content is None:
+        raise ValueError("MyAnimeList seasonal list not found on the season page")
     animes = content.find_all('div', {'class': 'js-anime-category-producer seasonal-anime js-seasonal-anime js-anime-type-all js-anime-type-1'})
-    for anime in tqdm(animes, desc="Processing ENG"):
+    for anime in animes:
         name = anime.find('span', {'class': 'js-title'}).text
         link = anime.find('a')['href']
-        day, time = get_date_time(link)
-        if day is None or time is None:
-            continue
         img_tag = anime.find('img')
         img = img_tag.get('src') or img_tag.get('data-src')
+        entries.append((name, link, img))
+    return entries
+
+def anime_eng(detail_cache=None):
+    url = 'https://myanimelist.net/anime/season/{}'.format(get_curr_season(True))
+    entries = submit_parse(parse_eng_season, fetch_page(url)).result()
+
+    # Detail pages finished by an earlier, interrupted run are not fetched again
+    if detail_cache is None:
+        detail_cache = Checkpoint('eng_' + get_curr_season())
+    broadcasts = {}
+    for _, link, _ in entries:
+        broadcast = detail_cache.get(link)
+        if broadcast is not None:
+            broadcasts[link] = broadcast
+    missing = [link for _, link, _ in entries if link not in broadcasts]
+    broadcasts.update(fetch_and_parse(missing, parse_broadcast, desc="Processing ENG", checkpoint=detail_cache))
+    # Keep only this season's listed pages, one line each
+    detail_cache.compact({link for _, link, _ in entries})
+
+    anime_list = []
+    for name, link, img in entries:
+        day, time = broadcasts.get(link, (None, None))
+        if day is None or time is None:
+            continue
         anime_list.append({"name": name, "day": day, "time": time, "timezone": "Asia/Tokyo", "img": img})
     return anime_list
 
@@ -144,59 +330,76 @@ def get_mongo_collection(db_name, collection_name, uri):
     collection = db[collection_name]
     return collection
 
-def store_anime_info(anime_name, anime_info_collection):
-    """Store or retrieve unique anime identifier based on name."""
-    anime_info = anime_info_collection.find_one({"name": anime_name})
-    if anime_info:
-        return anime_info["anime_id"]
-    else:
-        anime_id = str(uuid.uuid4())
-        anime_info_collection.insert_one({"anime_id": anime_id, "name": anime_name})
-        return anime_id
-
-def time_within_one_hour(time1, time2):
-    """Check if two times (in HH:MM format) are within one hour of each other."""
-    time1 = datetime.datetime.strptime(time1, '%H:%M')
-    time2 = datetime.datetime.strptime(time2, '%H:%M')
-    return abs((time1 - time2).total_seconds()) <= 3600
-
-def get_anime():
+def translation_doc(anime, cover_hash=None, thumbnail=None):
+    translation = {
+        "name": anime["name"],
+        "time": anime["time"],
+        "day": anime["day"],
+        "timezone": anime["timezone"],
+        "image_url": anime["img"]
+    }
+    if cover_hash is not None:
+        translation["cover_hash"] = format_hash(cover_hash)
+    if thumbnail is not None:
+        translation["thumbnail"] = thumbnail
+    return translation
+
+def get_anime(languages=None):
     all_anime = {}
-    languages = {"chs": anime_chs(), "cht": anime_cht(), "eng": anime_eng()}
+    if languages is None:
+        # The three sites are scraped side by side, their parsing shares the worker processes
+        start_parse_pool()
+        with ThreadPoolExecutor(3) as pool:
+            scrapes = {"chs": pool.submit(anime_chs), "cht": pool.submit(anime_cht), "eng": pool.submit(anime_eng)}
+            languages = {lang: future.result() for lang, future in scrapes.items()}
     mongodb_uri = load_mongodb_uri('config.json')
     anime_info_collection = get_mongo_collection('anime_db', 'anime_info_collection', mongodb_uri)
 
     # Use a bulk update for storing anime information
     anime_bulk_updates = []
 
-    for lang, anime_data in languages.items():
-        for anime in tqdm(anime_data, desc=f"Processing {lang.upper()} Data"):
-            anime_id = store_anime_info(anime["name"], anime_info_collection)
-
-            if anime_id not in all_anime:
-                all_anime[anime_id] = {"anime_id": anime_id, "translations": {}}
-            
-            added = False
-            for existing_lang, data in all_anime[anime_id]["translations"].items():
-                if anime["day"] == data["day"] and time_within_one_hour(anime["time"], data["time"]):
-                    all_anime[anime_id]["translations"][lang] = {
-                        "name": anime["name"],
-                        "time": anime["time"],
-                        "day": anime["day"],
-                        "timezone": anime["timezone"],
-                        "image_url": anime["img"]
-                    }
-                    added = True
-                    break
-             
-            if not added:
-                all_anime[anime_id]["translations"][lang] = {
-                    "name": anime["name"],
-                    "time": anime["time"],
-                    "day": anime["day"],
-                    "timezone": anime["timezone"],
-                    "image_url": anime["img"]
-                }
+    # Every cover is downloaded once into ready-to-display thumbnails,
+    # the perceptual hashes are then taken from the local copies
+    store = ThumbnailStore()
+    thumbnails = prefetch_thumbnails([anime["img"] for anime_data in languages.values() for anime in anime_data],
+                                     store, headers)
+    cover_hashes = hash_images({url: store.read(key, max(THUMBNAIL_SIZES)) for url, key in thumbnails.items()})
+
+    # Same show in several languages collapses into one merged entry,
+    # matching cover art then links what titles and airtimes could not
+    merged = link_by_cover(merge_schedules(languages), cover_hashes)
+    # Names seen in previous seasons resolve to the same anime_id
+    identity = TitleIndex.from_collection(anime_info_collection)
+    info_bulk_updates = []
+    # Ids given out in this run, so two shows never share one and overwrite each other
+    claimed = set()
+    for show in tqdm(merged, desc="Storing merged anime"):
+        names = [anime["name"] for anime in show.translations.values()]
+        image_urls = [anime["img"] for anime in show.translations.values() if anime["img"]]
+        show_hashes = [cover_hashes[url] for url in image_urls if url in cover_hashes]
+        anime_id = identity.resolve(names, show.minute, image_urls, show_hashes, claimed) or str(uuid.uuid4())
+        claimed.add(anime_id)
+        identity.add(anime_id, names, show.minute, image_urls, show_hashes)
+        info_bulk_updates.append(
+            UpdateOne(
+                {"anime_id": anime_id},
+                {
+                    "$setOnInsert": {"name": names[0]},
+                    "$set": {"minute": show.minute},
+                    "$addToSet": {"aliases": {"$each": names}, "image_urls": {"$each": image_urls},
+                                  "cover_hashes": {"$each": [format_hash(value) for value in show_hashes]}}
+                },
+                upsert=True
+            )
+        )
+
+        all_anime[anime_id] = {"anime_id": anime_id, "translations": {}}
+        for lang, anime in show.translations.items():
+            all_anime[anime_id]["translations"][lang] = translation_doc(
+                anime, cover_hashes.get(anime["img"]), thumbnails.get(anime["img"]))
+
+    if info_bulk_updates:
+        anime_info_collection.bulk_write(info_bulk_updates)
 
     anime_collection = get_mongo_collection('anime_db', 'anime_collection', mongodb_uri)
 
@@ -217,4 +420,9 @@ def get_anime():
     return all_anime
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Scrape this season's anime schedules")
+    parser.add_argument('--single-process', action='store_true', help="parse HTML in this process")
+    args = parser.parse_args()
+    if args.single_process:
+        set_parse_processes(1)
     anime_data = get_anime()
@@ -0,0 +1,168 @@
+"""Long-running scrape service keeping anime_collection fresh.
+
+    python scrape_daemon.py [--season-minutes 60] [--detail-hours 24]
+
+Each source is refreshed on its own jittered cadence instead of one cron job
+hitting all three sites at once. The CHS, CHT and MyAnimeList season pages
+refresh hourly, and MyAnimeList detail pages are reused for a day. A failing
+source backs off exponentially without holding up the others. When the
+quarter changes, every source is re-scraped for the new season.
+"""
+import time
+import random
+import argparse
+import threading
+
+import scrape
+import thumbnails
+
+SEASON_INTERVAL = 60 * 60
+DETAIL_MAX_AGE = 24 * 60 * 60
+# Intervals vary by up to this fraction so requests drift apart over time
+JITTER = 0.1
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 60 * 60
+# Sources start this far apart after launch or a season rollover
+START_STAGGER = 5 * 60
+# Longest sleep between season checks
+SEASON_CHECK = 5 * 60
+
+
+def jittered(seconds, jitter=JITTER):
+    return seconds * random.uniform(1 - jitter, 1 + jitter)
+
+
+def backoff(failures):
+    """Jittered exponential delay after `failures` consecutive failures."""
+    return jittered(min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX))
+
+
+class Source:
+    """One scraped site with its own cadence and failure count"""
+
+    def __init__(self, lang, fetch, interval):
+        self.lang = lang
+        self.fetch = fetch
+        self.interval = interval
+        self.failures = 0
+        self.next_run = 0.0
+        self.data = None
+
+    def succeeded(self):
+        self.failures = 0
+        self.next_run = time.time() + jittered(self.interval)
+
+    def failed(self):
+        self.failures += 1
+        self.next_run = time.time() + backoff(self.failures)
+
+
+class ScrapeDaemon:
+    def __init__(self, season_interval=SEASON_INTERVAL, detail_max_age=DETAIL_MAX_AGE):
+        self.detail_max_age = detail_max_age
+        # Checkpoint of this season's detail pages, also lets a restarted daemon resume
+        self.detail_cache = None
+        self.sources = [
+            Source("chs", scrape.anime_chs, season_interval),
+            Source("cht", scrape.anime_cht, season_interval),
+            Source("eng", lambda: scrape.anime_eng(self.detail_cache), season_interval),
+        ]
+        self.season = None
+        # Set when source data changed and has not been written yet, failed writes retry with backoff
+        self.dirty = False
+        self.store_failures = 0
+        self.next_store = 0.0
+        self.stopping = threading.Event()
+
+    def check_season(self):
+        """Start over with fresh data when the quarter rolls over."""
+        season = scrape.get_curr_season()
+        if season == self.season:
+            return
+        if self.season is not None:
+            print(f"Season rolled over to {season}, refreshing every source")
+        self.season = season
+        self.detail_cache = scrape.Checkpoint('eng_' + season, self.detail_max_age)
+        start = time.time()
+        for i, source in enumerate(self.sources):
+            source.data = None
+            source.failures = 0
+            source.next_run = start + i * START_STAGGER
+        self.dirty = False
+        self.store_failures = 0
+
+    def run_source(self, source):
+        try:
+            data = source.fetch()
+        except Exception as e:
+            source.failed()
+            print(f"{source.lang} refresh failed: {e}, "
+                  f"retry {source.failures} in {source.next_run - time.time():.0f}s")
+            return
+        source.succeeded()
+        if data != source.data:
+            source.data = data
+            self.dirty = True
+        if self.dirty:
+            self.store()
+
+    def store(self):
+        """Write the sources' data if it changed, returns whether the database is up to date."""
+        # Writing before every source has data would drop their translations
+        if not self.dirty or any(source.data is None for source in self.sources):
+            return not self.dirty
+        try:
+            scrape.get_anime({source.lang: source.data for source in self.sources})
+        except Exception as e:
+            self.store_failures += 1
+            self.next_store = time.time() + backoff(self.store_failures)
+            print(f"Error storing anime: {e}, "
+                  f"retry {self.store_failures} in {self.next_store - time.time():.0f}s")
+            return False
+        self.dirty = False
+        self.store_failures = 0
+        return True
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.check_season()
+            if self.store_failures and self.dirty and self.next_store <= time.time():
+                self.store()
+                continue
+            source = min(self.sources, key=lambda source: source.next_run)
+            delay = source.next_run - time.time()
+            if self.store_failures and self.dirty:
+                delay = min(delay, self.next_store - time.time())
+            if delay > 0:
+                self.stopping.wait(min(delay, SEASON_CHECK))
+                continue
+            self.run_source(source)
+
+    def stop(self):
+        self.stopping.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep anime_collection fresh")
+    parser.add_argument("--season-minutes", type=float, default=SEASON_INTERVAL / 60,
+                        help="refresh interval of the season pages")
+    parser.add_argument("--detail-hours", type=float, default=DETAIL_MAX_AGE / 3600,
+                        help="how long MyAnimeList detail pages are reused")
+    parser.add_argument("--single-process", action="store_true", help="parse HTML in this process")
+    parser.add_argument("--thumbnail-port", type=int, help="also serve cover thumbnails on this port")
+    args = parser.parse_args(argv)
+    if args.single_process:
+        scrape.set_parse_processes(1)
+    # Parse workers start before any other thread does
+    scrape.start_parse_pool()
+    if args.thumbnail_port:
+        thumbnails.serve_in_background(thumbnails.ThumbnailStore(), port=args.thumbnail_port)
+    daemon = ScrapeDaemon(args.season_minutes * 60, args.detail_hours * 3600)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        daemon.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Event-loop stall detector for the Qt main thread.
+
+A QTimer on the GUI thread stamps a heartbeat every HEARTBEAT_MS. A helper
+thread checks the stamp, and when the loop has not ticked for longer than the
+threshold it captures the main thread's Python stack with sys._current_frames()
+and logs it with the stall duration. One report is made per stall, and its
+total length is logged when the loop recovers.
+
+Enable with ARC_STALL_MS=<threshold ms> or --stall-watchdog[=ms].
+"""
+import os
+import sys
+import time
+import threading
+import traceback
+import logging as _logging
+
+from PyQt5.QtCore import QObject, QTimer
+
+from perf_trace import tracer
+
+logger = _logging.getLogger("stall_watchdog")
+
+HEARTBEAT_MS = 50
+DEFAULT_THRESHOLD_MS = 200
+
+
+def threshold_from_environment(argv=None):
+    """Stall threshold in ms from ARC_STALL_MS / --stall-watchdog, None if disabled."""
+    argv = sys.argv if argv is None else argv
+    threshold = os.environ.get("ARC_STALL_MS") or None
+    for arg in argv[1:]:
+        if arg == "--stall-watchdog":
+            threshold = threshold or DEFAULT_THRESHOLD_MS
+        elif arg.startswith("--stall-watchdog="):
+            threshold = arg.split("=", 1)[1] or DEFAULT_THRESHOLD_MS
+    try:
+        return float(threshold) if threshold is not None else None
+    except ValueError:
+        return DEFAULT_THRESHOLD_MS
+
+
+class StallWatchdog(QObject):
+    """Logs the GUI thread's stack whenever the Qt event loop stalls"""
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self.main_thread_id = threading.main_thread().ident
+        self.last_beat = time.perf_counter()
+        self.stall_reported = False
+        self.stopping = threading.Event()
+        self.heartbeat = QTimer(self)
+        self.heartbeat.timeout.connect(self.beat)
+        self.monitor = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+
+    def start(self):
+        if not logger.handlers:
+            handler = _logging.StreamHandler()
+            handler.setFormatter(_logging.Formatter("[%(name)s] %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(_logging.INFO)
+        self.last_beat = time.perf_counter()
+        self.heartbeat.start(HEARTBEAT_MS)
+        self.monitor.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.heartbeat.stop()
+
+    def beat(self):
+        # GUI thread: the loop is alive again
+        now = time.perf_counter()
+        if self.stall_reported:
+            stalled = now - self.last_beat
+            logger.warning("Event loop recovered after %.0f ms", stalled * 1000)
+            tracer.record("ui.stall", self.last_beat, stalled, "ui")
+            self.stall_reported = False
+        self.last_beat = now
+
+    def watch(self):
+        # Helper thread: poll at a fraction of the threshold so stalls are caught early
+        interval = max(self.threshold / 4, HEARTBEAT_MS / 1000.0)
+        while not self.stopping.wait(interval):
+            stalled = time.perf_counter() - self.last_beat - HEARTBEAT_MS / 1000.0
+            if stalled > self.threshold and not self.stall_reported:
+                self.stall_reported = True
+                self.report(stalled)
+
+    def report(self, stalled):
+        frame = sys._current_frames().get(self.main_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "<no stack>\n"
+        logger.warning("Event loop stalled for %.0f ms, main thread at:\n%s",
+                       stalled * 1000, stack)
@@ -0,0 +1,39 @@
+from anime_identity import TitleIndex
+
+# Thursday 23:00 and the following Saturday 23:30, in minutes of the week
+THURSDAY_2300 = 3 * 24 * 60 + 23 * 60
+SATURDAY_2330 = 5 * 24 * 60 + 23 * 60 + 30
+
+
+def make_index():
+    index = TitleIndex()
+    index.add("slime", ["Tensei shitara Slime Datta Ken"], THURSDAY_2300, ["https://img/slime.jpg"], [0x0F0F0F0F0F0F0F0F])
+    index.add("mha", ["Boku no Hero Academia"], THURSDAY_2300, ["https://img/mha.jpg"], [0x123456789ABCDEF0])
+    return index
+
+
+def test_sibling_with_similar_title_at_same_time_is_new():
+    assert make_index().resolve(["Tensei shitara Dainana Ouji Datta node"], THURSDAY_2300) is None
+
+
+def test_spin_off_airing_days_apart_is_new():
+    assert make_index().resolve(["Vigilante: Boku no Hero Academia Illegals"], SATURDAY_2330) is None
+
+
+def test_sequel_in_same_slot_reuses_id():
+    index = make_index()
+    assert index.resolve(["Boku no Hero Academia 7th Season"], THURSDAY_2300 + 30) == "mha"
+
+
+def test_sequel_in_new_slot_reuses_id_on_matching_cover():
+    index = make_index()
+    # Two bits away from the stored hash, a re-encoded copy of the same key visual
+    assert index.resolve(["Tensei shitara Slime Datta Ken 3rd Season"], SATURDAY_2330,
+                         cover_hashes=[0x0F0F0F0F0F0F0F0C]) == "slime"
+
+
+def test_claimed_ids_are_not_reused():
+    index = make_index()
+    assert index.resolve(["Boku no Hero Academia"], THURSDAY_2300) == "mha"
+    assert index.resolve(["Boku no Hero Academia"], THURSDAY_2300, exclude={"mha"}) is None
+    assert index.resolve(["Boku no Hero Academia 7th Season"], THURSDAY_2300, exclude={"mha"}) is None
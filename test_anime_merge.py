@@ -0,0 +1,33 @@
+from anime_merge import merge_schedules
+
+
+def record(name, day=4, time="23:00"):
+    return {"name": name, "day": day, "time": time, "timezone": "Asia/Tokyo", "img": ""}
+
+
+def test_title_match_beats_earlier_airtime_only_match():
+    shows = merge_schedules({
+        "chs": [record("葬送的芙莉莲")],
+        # Another show in the same slot is listed before the real translation
+        "cht": [record("藥師少女的獨語"), record("葬送的芙莉蓮")],
+    })
+    frieren = [show for show in shows if "chs" in show.translations]
+    assert len(frieren) == 1
+    assert frieren[0].translations["cht"]["name"] == "葬送的芙莉蓮"
+    assert len(shows) == 2
+
+
+def test_unambiguous_airtime_links_titles_in_different_scripts():
+    shows = merge_schedules({
+        "chs": [record("葬送的芙莉莲")],
+        "eng": [record("Sousou no Frieren")],
+    })
+    assert len(shows) == 1
+
+
+def test_ambiguous_airtime_does_not_merge():
+    shows = merge_schedules({
+        "chs": [record("葬送的芙莉莲"), record("药屋少女的呢喃")],
+        "eng": [record("Sousou no Frieren")],
+    })
+    assert len(shows) == 3
@@ -0,0 +1,30 @@
+import anime_schedule
+from anime_schedule import MINUTES_PER_DAY, load_schedule
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, *_):
+        return iter(self.documents)
+
+
+def translation(name, day=0, time="12:00"):
+    return {"name": name, "day": day, "time": time, "timezone": "UTC", "image_url": ""}
+
+
+def test_malformed_translation_is_skipped(monkeypatch):
+    monkeypatch.setattr(anime_schedule, "local_shift_minutes", lambda timezone: 0)
+    search_documents = {}
+    anime_list = load_schedule(FakeCollection([
+        {"anime_id": "good", "translations": {"chs": translation("好", 1, "23:30")}},
+        {"anime_id": "bad-time", "translations": {"eng": translation("Broken", 2, "late")}},
+        {"anime_id": "no-time", "translations": {"eng": {"name": "Missing", "day": 3, "time": None}}},
+        {"anime_id": "mixed", "translations": {"chs": translation("坏", 4, "25"),
+                                               "eng": translation("Mixed", 4, "20:00")}},
+    ]), search_documents=search_documents)
+    assert [entry.name for entry in anime_list] == ["好"]
+    assert anime_list[0].minute_of_week == MINUTES_PER_DAY + 23 * 60 + 30
+    assert set(search_documents) == {"good", "mixed"}
+    assert search_documents["mixed"][1].name == "Mixed"
@@ -0,0 +1,50 @@
+from anime_schedule import AnimeEntry
+from anime_search import SearchIndex
+
+
+def entry(name, minute=0):
+    return AnimeEntry(minute, name, "UTC", "", "chs")
+
+
+def make_index():
+    index = SearchIndex()
+    index.update({
+        "jjk": (["咒术回战", "咒術迴戰", "Jujutsu Kaisen"], entry("咒术回战")),
+        "frieren": (["葬送的芙莉莲", "Sousou no Frieren"], entry("葬送的芙莉莲")),
+        "kaiju": (["Kaijuu 8-gou"], entry("Kaijuu 8-gou")),
+    })
+    return index
+
+
+def test_finds_by_any_language_ignoring_case_and_punctuation():
+    index = make_index()
+    assert [e.name for e in index.search("JUJUTSU-kaisen")][:1] == ["咒术回战"]
+    assert [e.name for e in index.search("咒術迴戰")][:1] == ["咒术回战"]
+    assert [e.name for e in index.search("sousou no frieren")] == ["葬送的芙莉莲"]
+
+
+def test_tolerates_typos_and_short_queries():
+    index = make_index()
+    assert [e.name for e in index.search("jujustu kaisen")][:1] == ["咒术回战"]
+    # Shorter than a trigram, matched as a substring
+    assert [e.name for e in index.search("芙莉")] == ["葬送的芙莉莲"]
+    assert index.search("") == []
+    assert index.search("zzzzzz") == []
+
+
+def test_prefix_matches_rank_first():
+    index = make_index()
+    assert [e.name for e in index.search("kai")][0] == "Kaijuu 8-gou"
+
+
+def test_update_is_incremental():
+    index = make_index()
+    index.update({
+        "jjk": (["咒术回战", "Jujutsu Kaisen"], entry("咒术回战", 60)),
+        "frieren": (["葬送的芙莉莲", "Sousou no Frieren"], entry("葬送的芙莉莲")),
+    })
+    assert len(index) == 2
+    assert index.search("kaijuu") == []
+    assert index.search("jujutsu")[0].minute_of_week == 60
+    # Removed titles leave no postings behind
+    assert "aij" not in index.postings
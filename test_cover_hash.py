@@ -0,0 +1,54 @@
+import pytest
+
+cover_hash = pytest.importorskip("cover_hash")
+from anime_merge import MergedAnime
+
+
+def grid(rows):
+    return bytes(value for row in rows for value in row)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_dhash_bits_follow_horizontal_gradient(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(cover_hash, "np", None)
+    elif cover_hash.np is None:
+        pytest.skip("NumPy not installed")
+    rising = grid([range(9)] * 8)
+    falling = grid([range(9, 0, -1)] * 8)
+    first_column_only = grid([[0, 1] + [1] * 7] * 8)
+    assert cover_hash.dhash_batch([rising, falling, first_column_only]) == [
+        2 ** 64 - 1, 0, sum(1 << (63 - 8 * row) for row in range(8))]
+
+
+def test_bk_tree_finds_hashes_within_radius_closest_first():
+    tree = cover_hash.BKTree()
+    for value, item in [(0b0000, "a"), (0b0001, "b"), (0b0111, "c"), (0b1111, "d"), (0b0000, "a2")]:
+        tree.add(value, item)
+    assert tree.search(0b0000, 1) == [(0, "a"), (0, "a2"), (1, "b")]
+    assert tree.search(0b1110, 2) == [(1, "d"), (2, "c")]
+    assert cover_hash.BKTree().search(0, 64) == []
+
+
+def show(lang, name, minute, img):
+    merged = MergedAnime(minute)
+    merged.add(lang, {"name": name, "img": img}, set())
+    return merged
+
+
+def test_link_by_cover_joins_disjoint_languages_with_matching_art():
+    hashes = {"chs.jpg": 0x0F0F0F0F0F0F0F0F, "eng.jpg": 0x0F0F0F0F0F0F0F0C, "other.jpg": 0xF0F0F0F0F0F0F0F0}
+    shows = [show("chs", "葬送的芙莉莲", 100, "chs.jpg"),
+             show("eng", "Sousou no Frieren", 130, "eng.jpg"),
+             show("cht", "別的", 100, "other.jpg")]
+    linked = cover_hash.link_by_cover(shows, hashes)
+    assert len(linked) == 2
+    assert set(linked[0].translations) == {"chs", "eng"}
+
+
+def test_link_by_cover_keeps_same_language_and_distant_airtimes_apart():
+    hashes = {"a.jpg": 0x1234, "b.jpg": 0x1234, "c.jpg": 0x1234}
+    shows = [show("chs", "一", 100, "a.jpg"),
+             show("chs", "二", 100, "b.jpg"),
+             show("eng", "Three", 100 + 24 * 60, "c.jpg")]
+    assert len(cover_hash.link_by_cover(shows, hashes)) == 3
@@ -0,0 +1,82 @@
+import datetime
+import threading
+import http.client
+
+import pytest
+
+import schedule_service
+from anime_schedule import AnimeEntry, MINUTES_PER_DAY
+from schedule_service import ScheduleService, ScheduleSnapshot, fetch_schedule
+
+
+def make_snapshot(name="Slime"):
+    anime_list = [AnimeEntry(day * MINUTES_PER_DAY + 12 * 60, f"{name} {day}", "UTC", "", "eng")
+                  for day in range(7)]
+    return ScheduleSnapshot(anime_list, {"slime": (["Slime"], anime_list[0])})
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(schedule_service, "_week_cache", {})
+    service = ScheduleService("mongodb://unused")
+    service.snapshot = make_snapshot()
+    return service
+
+
+@pytest.fixture
+def base_url(service):
+    server = schedule_service.make_server(service, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield "http://%s:%d" % server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def get(base_url, path, headers=None):
+    connection = http.client.HTTPConnection(base_url[len("http://"):], timeout=10)
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.getheader("ETag"), response.read()
+    finally:
+        connection.close()
+
+
+def test_etag_revalidation(service, base_url):
+    status, etag, body = get(base_url, "/week")
+    assert (status, body) == (200, service.snapshot.week[0])
+    assert etag == service.snapshot.week[1]
+    assert get(base_url, "/week", {"If-None-Match": etag}) == (304, etag, b"")
+
+    service.snapshot = make_snapshot("Frieren")
+    status, new_etag, body = get(base_url, "/week", {"If-None-Match": etag})
+    assert status == 200 and new_etag != etag and b"Frieren" in body
+
+
+def test_today_and_upcoming(service, base_url):
+    today = datetime.date.today().weekday()
+    assert get(base_url, "/today")[2] == service.snapshot.days[today][0]
+    status, etag, _ = get(base_url, "/upcoming")
+    assert status == 200
+    assert get(base_url, "/upcoming", {"If-None-Match": etag})[0] == 304
+
+
+def test_unknown_route_is_404(base_url):
+    assert get(base_url, "/month")[0] == 404
+
+
+def test_fetch_schedule_reuses_payload_on_304(service, base_url):
+    search_documents = {}
+    anime_list = fetch_schedule(base_url, search_documents)
+    assert anime_list == service.snapshot.anime_list
+    assert search_documents == {"slime": (["Slime"], anime_list[0])}
+
+    # A 304 answer must come from the cache, which is marked to tell it apart
+    url = base_url + "/week"
+    etag, payload = schedule_service._week_cache[url]
+    schedule_service._week_cache[url] = (etag, dict(payload, entries=payload["entries"][:1]))
+    assert fetch_schedule(base_url) == anime_list[:1]
+
+    service.snapshot = make_snapshot("Frieren")
+    assert fetch_schedule(base_url)[0].name == "Frieren 0"
+    assert schedule_service._week_cache[url][0] == service.snapshot.week[1]
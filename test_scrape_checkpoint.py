@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+scrape = pytest.importorskip("scrape")
+
+
+def test_results_survive_a_restart(tmp_path):
+    checkpoint = scrape.Checkpoint("eng_test", directory=str(tmp_path))
+    checkpoint["https://a"] = ["Monday", "23:00"]
+    checkpoint["https://b"] = [None, None]
+    resumed = scrape.Checkpoint("eng_test", directory=str(tmp_path))
+    assert resumed.get("https://a") == ["Monday", "23:00"]
+    assert resumed.get("https://b") == [None, None]
+    assert resumed.get("https://c") is None
+
+
+def test_torn_last_line_is_skipped_and_not_corrupting(tmp_path):
+    checkpoint = scrape.Checkpoint("eng_test", directory=str(tmp_path))
+    checkpoint["https://a"] = ["Monday", "23:00"]
+    with open(checkpoint.path, "a", encoding="utf-8") as file:
+        file.write('{"url": "https://b", "at"')
+    resumed = scrape.Checkpoint("eng_test", directory=str(tmp_path))
+    assert resumed.get("https://b") is None
+    resumed["https://c"] = ["Friday", "01:30"]
+    again = scrape.Checkpoint("eng_test", directory=str(tmp_path))
+    assert again.get("https://a") == ["Monday", "23:00"]
+    assert again.get("https://c") == ["Friday", "01:30"]
+
+
+def test_expired_results_are_refetched(tmp_path):
+    checkpoint = scrape.Checkpoint("eng_test", max_age=-1, directory=str(tmp_path))
+    checkpoint["https://a"] = ["Monday", "23:00"]
+    assert checkpoint.get("https://a") is None
+
+
+def test_compact_keeps_one_fresh_line_per_listed_url(tmp_path):
+    checkpoint = scrape.Checkpoint("eng_test", directory=str(tmp_path))
+    checkpoint["https://a"] = ["Monday", "22:00"]
+    checkpoint["https://a"] = ["Monday", "23:00"]
+    checkpoint["https://gone"] = ["Tuesday", "12:00"]
+    checkpoint.compact({"https://a"})
+    with open(checkpoint.path, encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert [(line["url"], line["result"]) for line in lines] == [("https://a", ["Monday", "23:00"])]
+    assert scrape.Checkpoint("eng_test", directory=str(tmp_path)).get("https://a") == ["Monday", "23:00"]
@@ -0,0 +1,67 @@
+import pytest
+
+scrape_daemon = pytest.importorskip("scrape_daemon")
+scrape = scrape_daemon.scrape
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(scrape_daemon, "jittered", lambda seconds: seconds)
+    monkeypatch.setattr(scrape_daemon.time, "time", lambda: 1000.0)
+
+
+def test_source_backoff_doubles_and_resets():
+    source = scrape_daemon.Source("chs", None, interval=3600)
+    delays = []
+    for _ in range(12):
+        source.failed()
+        delays.append(source.next_run - 1000.0)
+    assert delays[:3] == [60, 120, 240]
+    assert delays[-1] == scrape_daemon.BACKOFF_MAX
+    source.succeeded()
+    assert source.failures == 0
+    assert source.next_run == 1000.0 + 3600
+
+
+def make_daemon(monkeypatch, writes):
+    daemon = scrape_daemon.ScrapeDaemon()
+    for source in daemon.sources:
+        source.data = [{"name": source.lang}]
+        source.fetch = lambda source=source: source.data
+    monkeypatch.setattr(scrape, "get_anime", writes)
+    return daemon
+
+
+def test_failed_store_is_retried_with_unchanged_data(monkeypatch):
+    calls = []
+
+    def writes(languages):
+        calls.append(languages)
+        if len(calls) == 1:
+            raise RuntimeError("database down")
+
+    daemon = make_daemon(monkeypatch, writes)
+    chs = daemon.sources[0]
+    chs.fetch = lambda: [{"name": "new"}]
+    daemon.run_source(chs)
+    assert len(calls) == 1 and daemon.dirty
+    assert daemon.next_store == 1000.0 + scrape_daemon.BACKOFF_BASE
+
+    # Upstream is unchanged on the next refresh, the write is still retried
+    daemon.run_source(chs)
+    assert len(calls) == 2
+    assert not daemon.dirty and daemon.store_failures == 0
+
+    daemon.run_source(chs)
+    assert len(calls) == 2
+
+
+def test_store_waits_for_every_source(monkeypatch):
+    calls = []
+    daemon = make_daemon(monkeypatch, calls.append)
+    daemon.sources[2].data = None
+    daemon.run_source(daemon.sources[0])
+    assert calls == [] and not daemon.dirty
+    daemon.sources[0].fetch = lambda: [{"name": "changed"}]
+    daemon.run_source(daemon.sources[0])
+    assert calls == [] and daemon.dirty
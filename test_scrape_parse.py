@@ -0,0 +1,55 @@
+import pytest
+
+scrape = pytest.importorskip("scrape")
+
+
+@pytest.fixture
+def single_process():
+    previous = scrape.PARSE_PROCESSES
+    scrape.set_parse_processes(1)
+    yield
+    scrape.set_parse_processes(previous)
+
+
+@pytest.mark.parametrize("value", [None, "", "many", "0", "-3"])
+def test_bad_process_count_falls_back(monkeypatch, value):
+    if value is None:
+        monkeypatch.delenv("SCRAPE_PROCESSES", raising=False)
+    else:
+        monkeypatch.setenv("SCRAPE_PROCESSES", value)
+    assert scrape.default_parse_processes() >= 1
+
+
+def test_process_count_from_environment(monkeypatch):
+    monkeypatch.setenv("SCRAPE_PROCESSES", "3")
+    assert scrape.default_parse_processes() == 3
+
+
+def test_inline_parse_returns_result_and_error(single_process):
+    assert scrape.submit_parse(str.upper, "abc").result() == "ABC"
+    with pytest.raises(ValueError):
+        scrape.submit_parse(int, "not a number").result()
+
+
+def test_fetch_and_parse_skips_failures_and_checkpoints(monkeypatch, single_process):
+    pages = {"https://a": "1", "https://b": "x"}
+
+    def fetch_page(url):
+        if url not in pages:
+            raise IOError("unreachable")
+        return pages[url]
+
+    monkeypatch.setattr(scrape, "fetch_page", fetch_page)
+    saved = {}
+    results = scrape.fetch_and_parse(["https://a", "https://b", "https://c"], int, checkpoint=saved)
+    assert results == {"https://a": 1}
+    assert saved == {"https://a": 1}
+
+
+def test_spawned_pool_parses():
+    previous = scrape.PARSE_PROCESSES
+    scrape.set_parse_processes(2)
+    try:
+        assert scrape.submit_parse(len, "abcd").result(timeout=60) == 4
+    finally:
+        scrape.set_parse_processes(previous)
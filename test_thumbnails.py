@@ -0,0 +1,58 @@
+import threading
+import http.client
+
+import pytest
+
+thumbnails = pytest.importorskip("thumbnails")
+
+KEY = "0123456789abcdef0123"
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = thumbnails.ThumbnailStore(str(tmp_path / "thumbnails"))
+    with open(store.path(KEY, 100), "wb") as file:
+        file.write(b"thumbnail")
+    # A file outside the store that path traversal must not reach
+    (tmp_path / "secret_100").write_bytes(b"secret")
+    server = thumbnails.make_server(store, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.getheader("ETag"), response.read()
+    finally:
+        connection.close()
+
+
+def test_serves_stored_thumbnail(server):
+    status, etag, body = get(server, f"/thumbnails/{KEY}/100")
+    assert (status, etag, body) == (200, f'"{KEY}_100"', b"thumbnail")
+
+
+def test_matching_etag_is_not_modified(server):
+    status, _, body = get(server, f"/thumbnails/{KEY}/100", {"If-None-Match": f'"{KEY}_100"'})
+    assert (status, body) == (304, b"")
+
+
+@pytest.mark.parametrize("path", [
+    "/thumbnails/../secret/100",
+    "/thumbnails/..%2Fsecret/100",
+    "/thumbnails/%2E%2E/100",
+    f"/thumbnails/{KEY}/../../secret_100",
+    f"/thumbnails/{KEY}/abc",
+    f"/thumbnails/{KEY}/-100",
+    f"/thumbnails/{KEY}",
+    f"/other/{KEY}/100",
+    f"/thumbnails/{KEY}/200",
+    "/thumbnails/ffffffffffffffffffff/100",
+])
+def test_rejects_invalid_or_missing_paths(server, path):
+    assert get(server, path)[0] == 404
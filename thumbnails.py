@@ -0,0 +1,175 @@
+"""Pre-scaled cover thumbnails produced by the scraper.
+
+Every scraped cover is downloaded once, centre-cropped to a square and encoded
+as WebP (JPEG when Pillow lacks WebP) at the sizes the clients display. The
+files are stored under the SHA-1 of the original image, so unchanged covers
+are never encoded twice, and served read-only over HTTP:
+
+    python thumbnails.py --port 8765
+
+Clients that set ARC_THUMBNAIL_URL=http://<host>:8765/thumbnails fetch
+<base>/<hash>/<size> instead of the full-size original.
+"""
+import os
+import json
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import requests
+from PIL import Image, features
+
+THUMBNAIL_SIZES = (100, 200)
+THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_PORT = 8765
+DOWNLOAD_WORKERS = 8
+# Cover URL -> content hash, so covers already stored are not downloaded again
+INDEX_FILE = 'index.json'
+
+if features.check('webp'):
+    FORMAT, EXTENSION, CONTENT_TYPE = 'WEBP', '.webp', 'image/webp'
+else:
+    FORMAT, EXTENSION, CONTENT_TYPE = 'JPEG', '.jpg', 'image/jpeg'
+
+
+def square_thumbnail(image, size):
+    """Scale to cover a size x size square and crop the overflow evenly."""
+    scale = size / min(image.size)
+    width, height = max(size, round(image.width * scale)), max(size, round(image.height * scale))
+    image = image.resize((width, height), Image.LANCZOS)
+    left, top = (width - size) // 2, (height - size) // 2
+    return image.crop((left, top, left + size, top + size))
+
+
+def encode_thumbnails(data, sizes=THUMBNAIL_SIZES):
+    """{size: encoded bytes} for an original cover image."""
+    with Image.open(BytesIO(data)) as image:
+        image.draft('RGB', (max(sizes) * 2, max(sizes) * 2))
+        image = image.convert('RGB')
+        encoded = {}
+        for size in sizes:
+            output = BytesIO()
+            square_thumbnail(image, size).save(output, FORMAT, quality=80)
+            encoded[size] = output.getvalue()
+        return encoded
+
+
+class ThumbnailStore:
+    """Content-addressed thumbnail files in a local directory"""
+
+    def __init__(self, directory=THUMBNAIL_DIR):
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(os.path.join(directory, INDEX_FILE), 'r', encoding='utf-8') as file:
+                self.index = json.load(file)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def path(self, key, size):
+        return os.path.join(self.directory, f'{key}_{size}{EXTENSION}')
+
+    def has(self, key, sizes=THUMBNAIL_SIZES):
+        return all(os.path.exists(self.path(key, size)) for size in sizes)
+
+    def read(self, key, size):
+        with open(self.path(key, size), 'rb') as file:
+            return file.read()
+
+    def put(self, url, data, sizes=THUMBNAIL_SIZES):
+        """Store thumbnails for an original cover and return its content hash."""
+        key = hashlib.sha1(data).hexdigest()[:20]
+        if not self.has(key, sizes):
+            for size, encoded in encode_thumbnails(data, sizes).items():
+                # Write then rename so the server never sends a half-written file
+                temporary = f'{self.path(key, size)}.{threading.get_ident()}.tmp'
+                with open(temporary, 'wb') as file:
+                    file.write(encoded)
+                os.replace(temporary, self.path(key, size))
+        with self.lock:
+            self.index[url] = key
+        return key
+
+    def save_index(self):
+        with self.lock:
+            index = dict(self.index)
+        temporary = os.path.join(self.directory, INDEX_FILE + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(index, file)
+        os.replace(temporary, os.path.join(self.directory, INDEX_FILE))
+
+
+def prefetch_thumbnails(urls, store, headers=None, workers=DOWNLOAD_WORKERS):
+    """Download and thumbnail covers concurrently, returns {url: content hash}."""
+    def prefetch(url):
+        key = store.index.get(url)
+        if key is not None and store.has(key):
+            return key
+        try:
+            response = requests.get(url, headers=headers, timeout=10)
+            response.raise_for_status()
+            return store.put(url, response.content)
+        except Exception as e:
+            print(e, "thumbnail error", url)
+            return None
+
+    urls = sorted({url for url in urls if url})
+    with ThreadPoolExecutor(workers, 'thumbnail') as pool:
+        keys = dict(zip(urls, pool.map(prefetch, urls)))
+    store.save_index()
+    return {url: key for url, key in keys.items() if key is not None}
+
+
+def make_server(store, host='0.0.0.0', port=THUMBNAIL_PORT):
+    """HTTP server answering GET /thumbnails/<hash>/<size> from the store."""
+    class ThumbnailHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = self.path.strip('/').split('/')
+            if len(parts) != 3 or parts[0] != 'thumbnails' or not parts[1].isalnum() or not parts[2].isdigit():
+                self.send_error(404)
+                return
+            key, size = parts[1], int(parts[2])
+            etag = f'"{key}_{size}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            try:
+                body = store.read(key, size)
+            except OSError:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            # Names are content hashes, a URL never changes what it points to
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    return ThreadingHTTPServer((host, port), ThumbnailHandler)
+
+
+def serve_in_background(store, host='0.0.0.0', port=THUMBNAIL_PORT):
+    server = make_server(store, host, port)
+    threading.Thread(target=server.serve_forever, name='thumbnail-server', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve scraped cover thumbnails")
+    parser.add_argument('--dir', default=THUMBNAIL_DIR, help="thumbnail directory")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=THUMBNAIL_PORT)
+    args = parser.parse_args()
+    print(f"Serving {args.dir} on http://{args.host}:{args.port}/thumbnails")
+    make_server(ThumbnailStore(args.dir), args.host, args.port).serve_forever()
@@ -6,6 +6,7 @@ except ImportError:
     import Tkinter as tk
 import sys
 import os
+import time
 import platform
 import logging as _logging
 
@@ -24,8 +25,34 @@ logger = _logging.getLogger("tkinter_.py")
 # Tk 8.5 doesn't support png images
 IMAGE_EXT = ".png" if tk.TkVersion > 8.5 else ".gif"
 
+# Message pump cadence in ms: fast while loading or handling input, then
+# backing off exponentially to the slow cadence once the browser is idle.
+PUMP_FAST_MS = 10
+PUMP_SLOW_MS = 250
+PUMP_IDLE_AFTER_MS = 500
+
+# Longest wait for CEF's OnBeforeClose before the window is torn down anyway
+CLOSE_TIMEOUT_MS = 3000
+
+# Resize/move events are coalesced and applied at most once per frame interval
+RESIZE_INTERVAL_MS = 16
+
+_cef_initialized = False
+
+DEFAULT_URL = "https://www.google.com/"
+
 
 def web(frame):
+        # Tk must be initialized before CEF otherwise fatal error (Issue #306)
+        browser = MainFrame(frame)
+        initialize_cef()
+
+
+def initialize_cef():
+        """Initialize CEF once per process."""
+        global _cef_initialized
+        if _cef_initialized:
+            return
         logger.setLevel(_logging.DEBUG)
         stream_handler = _logging.StreamHandler()
         formatter = _logging.Formatter("[%(filename)s] %(message)s")
@@ -37,17 +64,87 @@ def web(frame):
         logger.info("Tk {ver}".format(ver=tk.Tcl().eval('info patchlevel')))
         assert cef.__version__ >= "55.3", "CEF Python v55.3+ required to run this"
         sys.excepthook = cef.ExceptHook  # To shutdown all CEF processes on error
-        # Tk must be initialized before CEF otherwise fatal error (Issue #306)
-        browser = MainFrame(frame)
         settings = {}
         if MAC:
             settings["external_message_pump"] = True
         cef.Initialize(settings=settings)
+        _cef_initialized = True
+
+
+class BrowserService(object):
+    """One warm browser in its own window, reused for every page the app opens.
+
+    CEF is initialized and the browser created during idle time after startup,
+    so opening a page later is only a LoadUrl on an existing browser.
+    """
+
+    def __init__(self, root, url="about:blank"):
+        self.root = root
+        self.url = url
+        self.window = None
+        self.main_frame = None
+
+    def warm_up(self):
+        if self.window is not None:
+            return
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Arc")
+        self.window.geometry("1024x720")
+        self.window.withdraw()
+        # Closing the window only hides it, the browser stays warm
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.main_frame = MainFrame(self.window, url=self.url)
+        self.main_frame.browser_frame.quit_on_close = False
+        initialize_cef()
+        # Create the browser now rather than on the first <Configure>
+        self.main_frame.browser_frame.embed_browser()
+
+    def open(self, url):
+        """Navigate the warm browser to url and bring its window up."""
+        self.warm_up()
+        self.main_frame.get_browser().LoadUrl(url)
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+
+    def close(self, on_closed=None):
+        """Close the browser, on_closed runs once CEF reports OnBeforeClose.
+
+        The window is destroyed afterwards, a later open() warms up a new browser.
+        """
+        browser_frame = self.main_frame.browser_frame if self.main_frame else None
+        done = []
+
+        def finished():
+            if done:
+                return
+            done.append(True)
+            window, self.window, self.main_frame = self.window, None, None
+            if browser_frame is not None:
+                browser_frame.closed = True
+                browser_frame.cancel_pump()
+            if window is not None:
+                window.destroy()
+            if on_closed is not None:
+                on_closed()
+
+        if browser_frame is None or browser_frame.browser is None:
+            finished()
+            return
+        # Deferred so the window isn't destroyed inside CEF's own callback
+        browser_frame.on_closed = lambda: self.root.after_idle(finished)
+        browser_frame.on_root_close()
+        self.root.after(CLOSE_TIMEOUT_MS, finished)
+
+    def shutdown(self):
+        """Shut CEF down, call after the Tk main loop has exited."""
+        if _cef_initialized:
+            cef.Shutdown()
 
 
 class MainFrame(tk.Frame):
 
-    def __init__(self, root):
+    def __init__(self, root, url=DEFAULT_URL):
         self.browser_frame = None
         self.navigation_bar = None
         self.root = root
@@ -72,7 +169,7 @@ class MainFrame(tk.Frame):
         # tk.Grid.columnconfigure(self, 0, weight=0)
 
         # BrowserFrame
-        self.browser_frame = BrowserFrame(self, self.navigation_bar)
+        self.browser_frame = BrowserFrame(self, self.navigation_bar, url)
 
         self.browser_frame.grid(row=1, column=0, sticky="nsew")
         #self.browser_frame.grid(row=1, column=0,sticky=(tk.N + tk.S + tk.E + tk.W))
@@ -95,7 +192,6 @@ class MainFrame(tk.Frame):
         if self.browser_frame:
             width = event.width
             height = event.height
-            print(width,height)
             if self.navigation_bar:
                 height = height - self.navigation_bar.winfo_height()
             self.browser_frame.on_mainframe_configure(width, height)
@@ -134,15 +230,36 @@ class MainFrame(tk.Frame):
 
 class BrowserFrame(tk.Frame):
 
-    def __init__(self, mainframe, navigation_bar=None):
+    def __init__(self, mainframe, navigation_bar=None, url=DEFAULT_URL):
         self.navigation_bar = navigation_bar
+        self.url = url
         self.closing = False
+        self.closed = False
+        # Quit the Tk main loop once the browser has closed
+        self.quit_on_close = True
+        # Called from OnBeforeClose, set by BrowserService.close
+        self.on_closed = None
         self.browser = None
+        self.loading = False
+        self.pump_job = None
+        self.pump_due = 0.0
+        self.pump_delay = PUMP_FAST_MS
+        self.last_activity = time.monotonic()
+        self.geometry_job = None
+        self.pending_size = None
+        self.applied_size = None
+        self.moved = False
         tk.Frame.__init__(self, mainframe)
         self.mainframe = mainframe
         self.bind("<FocusIn>", self.on_focus_in)
         self.bind("<FocusOut>", self.on_focus_out)
         self.bind("<Configure>", self.on_configure)
+        # A withdrawn toplevel leaves this frame "mapped", so the pump follows
+        # the toplevel's own Map/Unmap. Bindings on a toplevel also fire for its
+        # children, on_toplevel_map/unmap filter those out.
+        self.toplevel = self.winfo_toplevel()
+        self.toplevel.bind("<Map>", self.on_toplevel_map, add="+")
+        self.toplevel.bind("<Unmap>", self.on_toplevel_unmap, add="+")
         """For focus problems see Issue #255 and Issue #535. """
         self.focus_set()
 
@@ -151,11 +268,12 @@ class BrowserFrame(tk.Frame):
         rect = [0, 0, self.winfo_width(), self.winfo_height()]
         window_info.SetAsChild(self.get_window_handle(),rect)
         self.browser = cef.CreateBrowserSync(window_info,
-                                             url="https://www.google.com/")
+                                             url=self.url)
         assert self.browser
         self.browser.SetClientHandler(LifespanHandler(self))
         self.browser.SetClientHandler(LoadHandler(self))
         self.browser.SetClientHandler(FocusHandler(self))
+        self.browser.SetClientHandler(KeyboardHandler(self))
         self.message_loop_work()
 
     def get_window_handle(self):
@@ -193,8 +311,53 @@ class BrowserFrame(tk.Frame):
             raise Exception("Couldn't obtain window handle")
 
     def message_loop_work(self):
+        self.pump_job = None
         cef.MessageLoopWork()
-        self.after(10, self.message_loop_work)
+        self.schedule_pump(self.next_pump_delay())
+
+    def next_pump_delay(self):
+        idle_ms = (time.monotonic() - self.last_activity) * 1000
+        if self.loading or idle_ms < PUMP_IDLE_AFTER_MS:
+            self.pump_delay = PUMP_FAST_MS
+        else:
+            self.pump_delay = min(self.pump_delay * 2, PUMP_SLOW_MS)
+        return self.pump_delay
+
+    def schedule_pump(self, delay_ms):
+        """Run message_loop_work in delay_ms, keeping only the earliest pending run."""
+        if self.closed:
+            return
+        if not self.closing and not self.winfo_viewable():
+            # Paused while hidden, on_toplevel_map restarts the pump. Closing needs
+            # the pump to keep running until OnBeforeClose.
+            return
+        due = time.monotonic() + delay_ms / 1000.0
+        if self.pump_job is not None:
+            if due >= self.pump_due:
+                return
+            self.after_cancel(self.pump_job)
+        self.pump_due = due
+        self.pump_job = self.after(int(delay_ms), self.message_loop_work)
+
+    def wake_pump(self):
+        """Note browser activity and go back to the fast cadence."""
+        self.last_activity = time.monotonic()
+        self.pump_delay = PUMP_FAST_MS
+        self.schedule_pump(PUMP_FAST_MS)
+
+    def cancel_pump(self):
+        if self.pump_job is not None:
+            self.after_cancel(self.pump_job)
+            self.pump_job = None
+
+    def on_toplevel_map(self, event):
+        if event.widget is self.toplevel:
+            self.wake_pump()
+
+    def on_toplevel_unmap(self, event):
+        if event.widget is self.toplevel and not self.closing:
+            logger.debug("BrowserFrame.on_toplevel_unmap, pausing message pump")
+            self.cancel_pump()
 
     def on_configure(self, _):
         if not self.browser:
@@ -203,22 +366,44 @@ class BrowserFrame(tk.Frame):
     def on_root_configure(self):
         # Root <Configure> event will be called when top window is moved
         if self.browser:
-            self.browser.NotifyMoveOrResizeStarted()
+            self.moved = True
+            self.schedule_geometry()
 
     def on_mainframe_configure(self, width, height):
         if self.browser:
+            # Only the last size seen within a frame interval is applied
+            self.pending_size = (width, height)
+            self.schedule_geometry()
+
+    def schedule_geometry(self):
+        if self.geometry_job is None:
+            self.geometry_job = self.after(RESIZE_INTERVAL_MS, self.apply_geometry)
+
+    def apply_geometry(self):
+        """Push the coalesced size/move to the browser with a single notify."""
+        self.geometry_job = None
+        if not self.browser:
+            return
+        size, self.pending_size = self.pending_size, None
+        if size and size != self.applied_size:
+            width, height = size
             if WINDOWS:
                 ctypes.windll.user32.SetWindowPos(
                     self.browser.GetWindowHandle(), 0,
                     0, 0, width, height, 0x0002)
             elif LINUX:
                 self.browser.SetBounds(0, 0, width, height)
+            self.applied_size = size
+            self.moved = True
+        if self.moved:
+            self.moved = False
             self.browser.NotifyMoveOrResizeStarted()
 
     def on_focus_in(self, _):
         logger.debug("BrowserFrame.on_focus_in")
         if self.browser:
             self.browser.SetFocus(True)
+            self.wake_pump()
 
     def on_focus_out(self, _):
         logger.debug("BrowserFrame.on_focus_out")
@@ -230,7 +415,9 @@ class BrowserFrame(tk.Frame):
         logger.info("BrowserFrame.on_root_close")
         if self.browser:
             logger.debug("CloseBrowser")
+            self.closing = True
             self.browser.CloseBrowser(True)
+            self.wake_pump()
             self.clear_browser_references()
         else:
             logger.debug("tk.Frame.destroy")
@@ -241,6 +428,8 @@ class BrowserFrame(tk.Frame):
         # Clear browser references that you keep anywhere in your
         # code. All references must be cleared for CEF to shutdown cleanly.
         self.browser = None
+        if self.navigation_bar:
+            self.navigation_bar.update_state(False, False)
 
 
 class LifespanHandler(object):
@@ -250,7 +439,11 @@ class LifespanHandler(object):
 
     def OnBeforeClose(self, browser, **_):
         logger.debug("LifespanHandler.OnBeforeClose")
-        self.tkFrame.quit()
+        if self.tkFrame.quit_on_close:
+            self.tkFrame.quit()
+        on_closed, self.tkFrame.on_closed = self.tkFrame.on_closed, None
+        if on_closed is not None:
+            on_closed()
 
 
 class LoadHandler(object):
@@ -262,6 +455,23 @@ class LoadHandler(object):
         if self.browser_frame.master.navigation_bar:
             self.browser_frame.master.navigation_bar.set_url(browser.GetUrl())
 
+    def OnLoadingStateChange(self, is_loading, can_go_back, can_go_forward, **_):
+        # Pump at full speed while a page loads, back off once it is done
+        self.browser_frame.loading = is_loading
+        self.browser_frame.wake_pump()
+        if self.browser_frame.master.navigation_bar:
+            self.browser_frame.master.navigation_bar.update_state(can_go_back, can_go_forward)
+
+
+class KeyboardHandler(object):
+
+    def __init__(self, browser_frame):
+        self.browser_frame = browser_frame
+
+    def OnPreKeyEvent(self, **_):
+        self.browser_frame.wake_pump()
+        return False
+
 
 class FocusHandler(object):
     """For focus problems see Issue #255 and Issue #535. """
@@ -283,6 +493,7 @@ class FocusHandler(object):
 
     def OnGotFocus(self, **_):
         logger.debug("FocusHandler.OnGotFocus")
+        self.browser_frame.wake_pump()
         if LINUX:
             self.browser_frame.focus_set()
 
@@ -334,8 +545,8 @@ class NavigationBar(tk.Frame):
         tk.Grid.rowconfigure(self, 0, weight=100)
         tk.Grid.columnconfigure(self, 3, weight=100)
 
-        # Update state of buttons
-        self.update_state()
+        # Buttons stay disabled until LoadHandler reports history state
+        self.update_state(False, False)
 
     def go_back(self):
         if self.master.get_browser():
@@ -369,34 +580,16 @@ class NavigationBar(tk.Frame):
         logger.debug("NavigationBar.on_button1")
         self.master.master.focus_force()
 
-    def update_state(self):
-        browser = self.master.get_browser()
-        if not browser:
-            if self.back_state != tk.DISABLED:
-                self.back_button.config(state=tk.DISABLED)
-                self.back_state = tk.DISABLED
-            if self.forward_state != tk.DISABLED:
-                self.forward_button.config(state=tk.DISABLED)
-                self.forward_state = tk.DISABLED
-            self.after(100, self.update_state)
-            return
-        if browser.CanGoBack():
-            if self.back_state != tk.NORMAL:
-                self.back_button.config(state=tk.NORMAL)
-                self.back_state = tk.NORMAL
-        else:
-            if self.back_state != tk.DISABLED:
-                self.back_button.config(state=tk.DISABLED)
-                self.back_state = tk.DISABLED
-        if browser.CanGoForward():
-            if self.forward_state != tk.NORMAL:
-                self.forward_button.config(state=tk.NORMAL)
-                self.forward_state = tk.NORMAL
-        else:
-            if self.forward_state != tk.DISABLED:
-                self.forward_button.config(state=tk.DISABLED)
-                self.forward_state = tk.DISABLED
-        self.after(100, self.update_state)
+    def update_state(self, can_go_back, can_go_forward):
+        """Apply back/forward availability pushed from LoadHandler.OnLoadingStateChange."""
+        back_state = tk.NORMAL if can_go_back else tk.DISABLED
+        if self.back_state != back_state:
+            self.back_button.config(state=back_state)
+            self.back_state = back_state
+        forward_state = tk.NORMAL if can_go_forward else tk.DISABLED
+        if self.forward_state != forward_state:
+            self.forward_button.config(state=forward_state)
+            self.forward_state = forward_state
 
 
 if __name__ == '__main__':